@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+ShAI API Test Client
+
+Shared setup for the API test scripts (test_agreebot.py and
+test_tokens.py): command line options, rate limiting, the optional
+response cache and the HTTP session. With BASE_URL set the scripts talk
+to a running server over a pooled requests.Session; without it they call
+the Flask app in-process through its test client, so no server or socket
+is needed.
+"""
+
+import argparse
+import atexit
+import os
+import threading
+from pathlib import Path
+
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+
+# Set BASE_URL (e.g. http://localhost:5000) to test a running server;
+# when unset the Flask app is called in-process
+BASE_URL = os.environ.get("BASE_URL", "").rstrip("/")
+
+DEFAULT_RPS = 5
+
+# Successful responses from earlier runs; only used with --cache
+CACHE_FILE = Path(__file__).parent / ".api_test_cache.json"
+
+
+class _InProcessResponse:
+    """The parts of requests.Response the test scripts use."""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.content = response.get_data()
+        self.text = response.get_data(as_text=True)
+
+
+class InProcessSession:
+    """requests.Session look-alike backed by the Flask test client."""
+
+    def __init__(self):
+        from app import app
+
+        self._app = app
+        # Test clients aren't meant to be shared between threads
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._app.test_client(use_cookies=False)
+        return client
+
+    def get(self, url, timeout=None, **kwargs):
+        return _InProcessResponse(self._client().get(url, **kwargs))
+
+    def post(self, url, timeout=None, **kwargs):
+        return _InProcessResponse(self._client().post(url, **kwargs))
+
+    def close(self):
+        pass
+
+
+def make_session(base_url, pool_maxsize):
+    """Return an HTTP session for `base_url`, or an in-process one if it's empty"""
+    if not base_url:
+        return InProcessSession()
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    atexit.register(session.close)
+    return session
+
+
+def log_line(message):
+    """Print a line in a single write so output from worker threads doesn't interleave"""
+    print(f"{message}\n", end="")
+
+
+def parse_args(description):
+    """Parse the command line options shared by the test scripts"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=DEFAULT_RPS,
+        help=f"maximum requests per second (default: {DEFAULT_RPS})",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"reuse successful responses saved in {CACHE_FILE.name} "
+        "instead of calling the server again",
+    )
+    args = parser.parse_args()
+    if args.rps <= 0:
+        parser.error("--rps must be greater than 0")
+    return args
+
+
+class ApiTestRun:
+    """Session, rate limiter and response cache shared by a script's workers.
+
+    Starts with the defaults (DEFAULT_RPS, cache disabled) so the script's
+    functions also work when imported; configure() applies the command line.
+    """
+
+    def __init__(self, pool_maxsize):
+        self.session = make_session(BASE_URL, pool_maxsize=pool_maxsize)
+        self.rate_limiter = TokenBucket(DEFAULT_RPS)
+        self.response_cache = ResponseCache(CACHE_FILE, enabled=False)
+
+    def configure(self, description):
+        """Apply the command line options and return them"""
+        args = parse_args(description)
+        self.rate_limiter = TokenBucket(args.rps)
+        self.response_cache = ResponseCache(CACHE_FILE, enabled=args.cache)
+        atexit.register(self.response_cache.save)
+        return args
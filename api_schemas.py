@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+ShAI API Response Schemas
+
+Typed shapes of the JSON responses read by the API test scripts
+(test_agreebot.py and test_tokens.py). Responses are decoded and
+validated with msgspec when it's installed (optional dependency), and
+built from plain JSON otherwise.
+"""
+
+import dataclasses
+import typing
+from dataclasses import dataclass, field
+
+from jsonutil import loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+@dataclass
+class AgreeResponse:
+    success: bool = False
+    agreements: typing.List[str] = field(default_factory=list)
+    error: typing.Optional[str] = None
+
+
+@dataclass
+class AgreeBatchResponse:
+    success: bool = False
+    results: typing.List[AgreeResponse] = field(default_factory=list)
+    error: typing.Optional[str] = None
+
+
+@dataclass
+class GenerateResponse:
+    success: bool = False
+    pickup_lines: typing.List[str] = field(default_factory=list)
+    error: typing.Optional[str] = None
+
+
+@dataclass
+class TokenResponse:
+    tokens: int = 0
+    gallons: float = 0.0
+
+
+def _from_builtins(cls, data):
+    """Build a schema instance from decoded JSON, ignoring unknown keys"""
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object for {cls.__name__}")
+
+    hints = typing.get_type_hints(cls)
+    kwargs = {}
+    for f in dataclasses.fields(cls):
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        item_type = typing.get_args(hints[f.name])
+        if item_type and dataclasses.is_dataclass(item_type[0]):
+            value = [_from_builtins(item_type[0], item) for item in value]
+        kwargs[f.name] = value
+    return cls(**kwargs)
+
+
+def make_decoder(cls):
+    """Return a function decoding JSON bytes into `cls`.
+
+    Invalid JSON or a mismatched shape raises ValueError.
+    """
+    if msgspec is not None:
+        decoder = msgspec.json.Decoder(cls)
+
+        def decode(data):
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+    else:
+
+        def decode(data):
+            return _from_builtins(cls, loads(data))
+
+    return decode
+
+
+def to_builtins(obj):
+    """Convert a schema instance to plain dicts/lists, e.g. for caching"""
+    return dataclasses.asdict(obj)
+
+
+def from_builtins(cls, data):
+    """Convert plain dicts/lists (e.g. from the cache) back into `cls`"""
+    if msgspec is not None:
+        return msgspec.convert(data, cls)
+    return _from_builtins(cls, data)
@@ -18,9 +18,9 @@ app.secret_key = os.environ.get("SECRET_KEY", "shae-ai-secret-key-2024")
 total_tokens_used = 0
 
 # Configuration
-CLAUDE_API_KEY = os.environ.get("CLAUDE_API_KEY")
 OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
 USE_LOCAL = os.environ.get("USE_LOCAL", "false").lower() == "true"
+MAX_BATCH_INPUTS = 20
 
 
 class PickupLineGenerator:
@@ -30,11 +30,13 @@ class PickupLineGenerator:
 
     def generate_with_claude(self, user_input):
         """Generate pickup lines using Claude Haiku"""
-        if not CLAUDE_API_KEY:
+        # Read at call time so key changes apply without re-importing the app
+        claude_api_key = os.environ.get("CLAUDE_API_KEY")
+        if not claude_api_key:
             raise Exception("Claude API key not configured")
 
         headers = {
-            "x-api-key": CLAUDE_API_KEY,
+            "x-api-key": claude_api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json",
         }
@@ -178,11 +180,13 @@ class AgreeBot:
 
     def generate_agreement_with_claude(self, user_input):
         """Generate agreeable responses using Claude"""
-        if not CLAUDE_API_KEY:
+        # Read at call time so key changes apply without re-importing the app
+        claude_api_key = os.environ.get("CLAUDE_API_KEY")
+        if not claude_api_key:
             raise Exception("Claude API key not configured")
 
         headers = {
-            "x-api-key": CLAUDE_API_KEY,
+            "x-api-key": claude_api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json",
         }
@@ -405,6 +409,68 @@ def generate_agreements():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route("/api/agree/batch", methods=["POST"])
+def generate_agreements_batch():
+    """API endpoint to generate agreeable responses for several inputs at once"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+
+        inputs = data.get("inputs")
+        if not isinstance(inputs, list) or not inputs:
+            return jsonify({"error": "No inputs provided"}), 400
+        if len(inputs) > MAX_BATCH_INPUTS:
+            return (
+                jsonify({"error": f"At most {MAX_BATCH_INPUTS} inputs per batch"}),
+                400,
+            )
+
+        results = []
+        for raw_input in inputs:
+            if not isinstance(raw_input, str):
+                results.append(
+                    {
+                        "success": False,
+                        "input": raw_input,
+                        "error": "Input must be a string",
+                    }
+                )
+                continue
+
+            user_input = raw_input.strip()
+            if not user_input:
+                results.append(
+                    {
+                        "success": False,
+                        "input": user_input,
+                        "error": "No input provided",
+                    }
+                )
+                continue
+
+            try:
+                agreements = agreebot.generate_agreements(user_input)
+                results.append(
+                    {"success": True, "input": user_input, "agreements": agreements}
+                )
+            except Exception as e:
+                results.append({"success": False, "input": user_input, "error": str(e)})
+
+        response = {
+            "success": True,
+            "results": results,
+            "timestamp": datetime.now().isoformat(),
+            "using_local": USE_LOCAL,
+        }
+
+        return jsonify(response)
+
+    except Exception as e:
+        logger.error(f"Error in agree batch endpoint: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route("/api/tokens")
 def get_token_usage():
     """API endpoint to get current token usage"""
@@ -427,7 +493,7 @@ def health_check():
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "using_local": USE_LOCAL,
-            "claude_configured": bool(CLAUDE_API_KEY),
+            "claude_configured": bool(os.environ.get("CLAUDE_API_KEY")),
             "total_tokens": total_tokens_used,
         }
     )
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+ShAI .env File Loader
+
+Shared, dependency-free parser for the project's .env file. Used by
+passenger_wsgi.py and start.py so both read the file the same way.
+
+Parsed results are cached per (path, mtime), so re-imports in recycled
+Passenger workers and repeated checks in start.py skip the file I/O
+until the file actually changes.
+"""
+
+import os
+import re
+from typing import Dict, Tuple
+
+# One KEY=value assignment per line, optionally prefixed with "export ".
+# Values may be double- or single-quoted; unquoted values end at an inline
+# " # comment" or trailing whitespace.
+_ENV_RE = re.compile(
+    rb"^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"
+    rb"(?:\"([^\"\n]*)\"|'([^'\n]*)'|([^\n]*?))"
+    rb"[ \t]*(?:[ \t]#[^\n]*)?\r?$",
+    re.MULTILINE,
+)
+
+# Parsed .env contents keyed by (path, mtime_ns)
+_ENV_CACHE: Dict[Tuple[str, int], Dict[str, str]] = {}
+
+
+def parse_env_file(path):
+    """Parse a .env file into a dict of KEY -> value.
+
+    Raises FileNotFoundError if the file does not exist. The returned dict is
+    shared with the cache and must not be modified.
+    """
+    path = os.fspath(path)
+    cache_key = (path, os.stat(path).st_mtime_ns)
+
+    cached = _ENV_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    env_vars = {
+        m[1].decode(): (m[2] or m[3] or m[4] or b"").decode()
+        for m in _ENV_RE.finditer(data)
+    }
+
+    # Drop stale entries for this path before caching the new parse
+    for stale_key in [k for k in _ENV_CACHE if k[0] == path]:
+        del _ENV_CACHE[stale_key]
+    _ENV_CACHE[cache_key] = env_vars
+
+    return env_vars
@@ -21,8 +21,10 @@ Usage:
 
 import os
 import sys
+import shutil
 import subprocess
 import argparse
+import asyncio
 import json
 from pathlib import Path
 
@@ -32,6 +34,8 @@ class DependencyInstaller:
 
     def __init__(self):
         self.project_root = Path(__file__).parent.absolute()
+        self.requirements_path = self.project_root / "requirements.txt"
+        self.manual_path = self.project_root / "MANUAL_INSTALL.txt"
         self.required_packages = [
             "flask>=2.3.0",
             "requests>=2.31.0",
@@ -75,24 +79,61 @@ class DependencyInstaller:
 
         print(f"{timestamp} {prefix} {message}")
 
+    def _dedupe_commands(self, commands):
+        """Drop commands whose executable resolves to an already-seen binary."""
+        seen = set()
+        candidates = []
+        for command in commands:
+            argv = [command] if isinstance(command, str) else command
+            found = shutil.which(argv[0])
+            key = (os.path.realpath(found) if found else argv[0], *argv[1:])
+            if key not in seen:
+                seen.add(key)
+                candidates.append(command)
+        return candidates
+
+    async def _probe_python(self, python_exe):
+        """Run `<python_exe> --version` and return (exe, stdout, returncode)."""
+        proc = await asyncio.create_subprocess_exec(
+            python_exe,
+            "--version",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return python_exe, stdout.decode(errors="replace"), proc.returncode
+
+    async def _probe_pythons(self, candidates):
+        """Probe all candidate executables concurrently."""
+        return await asyncio.gather(
+            *(self._probe_python(exe) for exe in candidates),
+            return_exceptions=True,
+        )
+
     def find_working_python(self):
         """Find a working Python executable."""
         self.log("Detecting Python installation...")
 
-        for python_exe in self.python_executables:
-            try:
-                result = subprocess.run(
-                    [python_exe, "--version"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
-                if result.returncode == 0:
-                    version = result.stdout.strip()
-                    self.log(f"Found Python: {python_exe} ({version})", "SUCCESS")
-                    return python_exe
-            except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
+        try:
+            candidates = self._dedupe_commands(self.python_executables)
+            results = asyncio.run(self._probe_pythons(candidates))
+        except Exception:
+            results = []
+
+        # Pick the first successful probe in the original preference order
+        for result in results:
+            if isinstance(result, BaseException):
                 continue
+            python_exe, stdout, returncode = result
+            if returncode == 0:
+                version = stdout.strip()
+                self.log(f"Found Python: {python_exe} ({version})", "SUCCESS")
+                return python_exe
 
         self.log("Could not find working Python executable", "ERROR")
         return None
@@ -101,7 +142,7 @@ class DependencyInstaller:
         """Find a working pip command."""
         self.log("Detecting pip installation...")
 
-        for pip_cmd in self.pip_commands:
+        for pip_cmd in self._dedupe_commands(self.pip_commands):
             try:
                 result = subprocess.run(
                     pip_cmd + ["--version"], capture_output=True, text=True, timeout=10
@@ -190,34 +231,33 @@ class DependencyInstaller:
     def install_from_requirements(self, requirements_file=None):
         """Install packages from requirements.txt."""
         if requirements_file is None:
-            requirements_file = self.project_root / "requirements.txt"
-
-        requirements_path = Path(requirements_file)
+            requirements_path = self.requirements_path
+        else:
+            requirements_path = Path(requirements_file)
 
-        if not requirements_path.exists():
+        try:
+            content = requirements_path.read_text()
+        except FileNotFoundError:
             self.log(f"Requirements file not found: {requirements_path}", "ERROR")
             return False
+        except Exception as e:
+            self.log(f"Error reading requirements file: {str(e)}", "ERROR")
+            return False
 
         self.log(f"Reading requirements from: {requirements_path}")
 
-        try:
-            with open(requirements_path, "r") as f:
-                packages = []
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        packages.append(line)
-
-            if not packages:
-                self.log("No packages found in requirements file", "WARNING")
-                return False
+        packages = []
+        for line in content.splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                packages.append(line)
 
-            return self.install_packages(packages)
-
-        except Exception as e:
-            self.log(f"Error reading requirements file: {str(e)}", "ERROR")
+        if not packages:
+            self.log("No packages found in requirements file", "WARNING")
             return False
 
+        return self.install_packages(packages)
+
     def install_packages(self, packages=None):
         """Install a list of packages."""
         if packages is None:
@@ -323,7 +363,7 @@ class DependencyInstaller:
 
     def create_manual_instructions(self):
         """Create manual installation instructions."""
-        instructions_file = self.project_root / "MANUAL_INSTALL.txt"
+        instructions_file = self.manual_path
 
         instructions = f"""ShAI Manual Installation Instructions
 {"=" * 40}
@@ -383,17 +423,27 @@ Requirements File Content:
 """
 
         # Add requirements content
-        requirements_file = self.project_root / "requirements.txt"
-        if requirements_file.exists():
-            with open(requirements_file, "r") as f:
-                instructions += f.read()
-        else:
-            for package in self.required_packages:
-                instructions += f"{package}\n"
+        try:
+            requirements_content = self.requirements_path.read_text()
+        except FileNotFoundError:
+            requirements_content = "".join(
+                f"{package}\n" for package in self.required_packages
+            )
+        instructions += requirements_content
+
+        # Skip the write if the rendered instructions match the existing file
+        try:
+            if instructions_file.read_text(encoding="utf-8") == instructions:
+                self.log(
+                    f"Manual instructions are up to date: {instructions_file}",
+                    "SUCCESS",
+                )
+                return True
+        except OSError:
+            pass
 
         try:
-            with open(instructions_file, "w") as f:
-                f.write(instructions)
+            instructions_file.write_text(instructions, encoding="utf-8")
             self.log(f"Created manual instructions: {instructions_file}", "SUCCESS")
             return True
         except Exception as e:
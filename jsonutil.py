@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+ShAI JSON Helpers
+
+One JSON encoder/decoder for the project's scripts and WSGI entry points.
+Uses orjson when it's installed (optional dependency) and the standard
+library json module otherwise; either way dumps() returns bytes.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the JSON library in use, for diagnostics
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+
+    def dumps(obj, indent=False):
+        """Serialize `obj` to JSON bytes, indented by two spaces if `indent`"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(obj, indent=False):
+        """Serialize `obj` to JSON bytes, indented by two spaces if `indent`"""
+        return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+    loads = json.loads
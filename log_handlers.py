@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+ShAI Buffered Log Handlers
+
+File handlers that write through a 64 KB buffer instead of flushing every
+record. Used by passenger_wsgi.py and wsgi.py for their log files.
+
+Routine records stay in the buffer until it fills or the file is closed;
+warnings and errors are flushed straight away so failures are on disk
+even if the worker is killed.
+"""
+
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+
+
+class BufferedHandlerMixin:
+    """Buffered writes for logging.FileHandler subclasses."""
+
+    buffer_size = 65536
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            # FileHandler only has an errors attribute from Python 3.9
+            errors=getattr(self, "errors", None),
+        )
+
+    def flush(self):
+        # Flushing after every record defeats the buffer; see emit()
+        pass
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.WARNING:
+            self.flush_buffer()
+
+    def flush_buffer(self):
+        """Write out anything still held in the buffer."""
+        super().flush()
+
+
+class BufferedFileHandler(BufferedHandlerMixin, logging.FileHandler):
+    """FileHandler with a 64 KB write buffer."""
+
+
+class BufferedRotatingFileHandler(BufferedHandlerMixin, RotatingFileHandler):
+    """RotatingFileHandler with a 64 KB write buffer.
+
+    Buffered records are also written on rollover.
+    """
+
+    # Formatted length of the record being emitted, set by shouldRollover()
+    _pending = 0
+
+    def _open(self):
+        stream = super()._open()
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def shouldRollover(self, record):
+        # Track the size ourselves: the base class seeks the stream, which
+        # would flush the buffer on every record
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            return False
+        self._pending = len("%s\n" % self.format(record))
+        return self._size + self._pending >= self.maxBytes
+
+    def emit(self, record):
+        super().emit(record)
+        self._size += self._pending
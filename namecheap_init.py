@@ -21,17 +21,22 @@ Usage:
     python namecheap_init.py --fix        # Fix common issues
 """
 
+import hashlib
+import importlib
+import importlib.util
 import os
+import re
+import stat
 import sys
-import subprocess
 import logging
 import json
+import threading
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime
-import traceback
-import urllib.request
-import ssl
-import argparse
+
+# subprocess, concurrent.futures, http.client, ssl and argparse are imported
+# inside the methods that use them to keep importing this module cheap
 
 # Setup logging
 logging.basicConfig(
@@ -39,15 +44,149 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Matches interpreter names such as "python3.10"
+_PYTHON_VERSION_RE = re.compile(r"python(\d+\.\d+)")
+
+# Claude API probe settings (context loads the CA bundle once per process)
+CLAUDE_API_HOST = "api.anthropic.com"
+_SSL_CTX = None
+
+# Environment variables included in debug reports, and which ones to mask
+_ENV_PREFIXES = ("FLASK_", "CLAUDE_", "USE_", "DEBUG", "SECRET")
+_SECRET_RE = re.compile(r"(?:KEY|SECRET|TOKEN|PASSWORD|PASSWD)", re.ASCII)
+
+
+_path_lock = threading.Lock()
+
+
+def _ensure_on_path(path):
+    """Put a directory at the front of sys.path exactly once."""
+    path = str(path)
+    with _path_lock:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def _get_ssl_context():
+    """Create the shared SSL context on first use."""
+    global _SSL_CTX
+    if _SSL_CTX is None:
+        import ssl
+
+        _SSL_CTX = ssl.create_default_context()
+        # Certificates in a capath directory load lazily, so an empty store
+        # alone doesn't mean there's no CA bundle
+        if not _SSL_CTX.cert_store_stats().get("x509_ca") and not _has_ca_paths(
+            ssl.get_default_verify_paths()
+        ):
+            _warn_missing_ca_bundle()
+    return _SSL_CTX
+
+
+def _has_ca_paths(verify_paths):
+    """Check whether OpenSSL's default CA file or directory exists."""
+    cafile, capath = verify_paths.cafile, verify_paths.capath
+    return bool(
+        (cafile and os.path.isfile(cafile)) or (capath and os.path.isdir(capath))
+    )
+
+
+def _warn_missing_ca_bundle():
+    """Warn that no CA certificates are available for HTTPS checks."""
+    logger.warning(
+        "No CA certificates found - HTTPS checks may fail certificate "
+        "verification. Install your host's CA bundle or set SSL_CERT_FILE."
+    )
+
+
+class _StepLogBuffer(logging.Filter):
+    """Logger filter that collects a thread's records until release()."""
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def start(self):
+        """Start holding back records logged from the current thread."""
+        self._local.records = []
+
+    def filter(self, record):
+        records = getattr(self._local, "records", None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
+    def release(self):
+        """Write the current thread's held records in one uninterrupted block."""
+        records, self._local.records = self._local.records, None
+        with self._write_lock:
+            for record in records:
+                logging.getLogger(record.name).handle(record)
+
+
+def _module_available(name):
+    """Check whether a module can be imported without executing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _safe_import(name):
+    """Import a module, reusing it if it's already loaded."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    # Cheap existence probe before executing any module code
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named '{name}'")
+
+    return importlib.import_module(name)
+
 
 class NamecheapInitializer:
     """Namecheap-specific initialization handler for ShAI."""
 
+    # Shared Claude probe transport: urllib3 pool if available, else None/False
+    _claude_pool = None
+    _claude_conn = None
+
+    # Files and directories whose permissions fix_common_issues enforces
+    _IMPORTANT_FILES = (
+        ("passenger_wsgi.py", 0o755),
+        ("app.py", 0o644),
+        (".env", 0o600),
+    )
+    _PROJECT_DIRS = ("logs", "tmp", "static", "templates")
+
     def __init__(self):
+        self._deps_cache = None
+        self._namecheap_cache = None
+        self._pythons_cache = None
+        self._entries = None
+        self._entries_mtime = 0
+
         self.project_root = Path(__file__).parent.absolute()
-        self.is_namecheap = self.detect_namecheap_hosting()
+        self._paths = {
+            name: self.project_root / name
+            for name in (
+                "app.py",
+                "passenger_wsgi.py",
+                "requirements.txt",
+                ".env",
+                ".env.example",
+                "logs",
+                "tmp",
+                "static",
+                "templates",
+            )
+        }
+        self._cache_path = self._paths["logs"] / ".init_cache.json"
         self.user_home = Path.home()
-        self.public_html = self.find_public_html()
+        self.is_namecheap = self.detect_namecheap_hosting()
 
         # Common Namecheap paths
         self.possible_python_paths = [
@@ -65,11 +204,18 @@ class NamecheapInitializer:
 
     def setup_logging(self):
         """Setup comprehensive logging for Namecheap deployment."""
-        logs_dir = self.project_root / "logs"
+        logs_dir = self._paths["logs"]
+        log_file = logs_dir / "namecheap_init.log"
+
+        # Don't stack duplicate file handlers when instantiated repeatedly
+        existing = {getattr(h, "baseFilename", None) for h in logger.handlers}
+        if str(log_file) in existing:
+            return
+
         logs_dir.mkdir(exist_ok=True)
 
-        # File handler for persistent logs
-        file_handler = logging.FileHandler(logs_dir / "namecheap_init.log")
+        # File handler for persistent logs (opened on first write)
+        file_handler = logging.FileHandler(log_file, delay=True)
         file_handler.setLevel(logging.DEBUG)
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -81,11 +227,18 @@ class NamecheapInitializer:
 
     def detect_namecheap_hosting(self):
         """Detect if we're running on Namecheap shared hosting."""
+        if self._namecheap_cache is not None:
+            return self._namecheap_cache
+
+        home = str(self.user_home)
+        cwd = str(Path.cwd())
+        path_env = os.environ.get("PATH", "").lower()
+
         indicators = [
-            "namecheap" in str(Path.home()).lower(),
-            "cpanel" in os.environ.get("PATH", "").lower(),
-            "public_html" in str(Path.cwd()),
-            "/home/" in str(Path.home()) and len(str(Path.home()).split("/")) >= 3,
+            "namecheap" in home.lower(),
+            "cpanel" in path_env,
+            "public_html" in cwd,
+            "/home/" in home and home.count("/") >= 2,
         ]
 
         detection_score = sum(indicators)
@@ -94,24 +247,132 @@ class NamecheapInitializer:
         logger.info(f"Namecheap hosting detection score: {detection_score}/4")
         logger.info(f"Detected as Namecheap hosting: {is_namecheap}")
 
+        self._namecheap_cache = is_namecheap
         return is_namecheap
 
+    @cached_property
+    def public_html(self):
+        """The public_html directory, located on first access."""
+        return self.find_public_html()
+
     def find_public_html(self):
         """Find the public_html directory."""
-        possible_paths = [
-            self.user_home / "public_html",
-            self.project_root.parent / "public_html",
-            Path("/home") / os.getenv("USER", "user") / "public_html",
-        ]
+        # Cheapest and most likely candidates first; build the rest lazily
+        candidates = (
+            lambda: self.user_home / "public_html",
+            lambda: self.project_root.parent / "public_html",
+            lambda: Path("/home") / os.getenv("USER", "user") / "public_html",
+        )
 
-        for path in possible_paths:
-            if path.exists():
-                logger.info(f"Found public_html at: {path}")
-                return path
+        for make_path in candidates:
+            path = make_path()
+            try:
+                os.stat(path)
+            except OSError:
+                continue
+            logger.info(f"Found public_html at: {path}")
+            return path
 
         logger.warning("Could not locate public_html directory")
         return self.user_home / "public_html"  # Default assumption
 
+    def _project_entries(self):
+        """Return the project root's entries by name, rescanning when it changes."""
+        try:
+            mtime = os.stat(self.project_root).st_mtime_ns
+        except OSError:
+            return {}
+
+        if self._entries is None or mtime != self._entries_mtime:
+            with os.scandir(self.project_root) as it:
+                self._entries = {entry.name: entry for entry in it}
+            self._entries_mtime = mtime
+
+        return self._entries
+
+    def _has_dir(self, name):
+        """Check for a project subdirectory using the cached scandir entry."""
+        entry = self._project_entries().get(name)
+        return entry is not None and entry.is_dir()
+
+    def _cache_key(self):
+        """Inputs that invalidate the on-disk probe cache when they change."""
+        key = []
+        for name in ("requirements.txt", ".env.example"):
+            try:
+                key.append(os.stat(self._paths[name]).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        key.append(list(sys.version_info[:2]))
+        key.append(sys.executable)
+        # Packages installed or removed outside install_dependencies (e.g. the
+        # manual `pip install --user` route) change a site-packages mtime
+        for site_dir in self._site_package_dirs():
+            try:
+                key.append([site_dir, os.stat(site_dir).st_mtime_ns])
+            except OSError:
+                key.append([site_dir, None])
+        return key
+
+    @staticmethod
+    def _site_package_dirs():
+        """Return the user and global site-packages directories on sys.path."""
+        import site
+
+        dirs = []
+        user_site = getattr(site, "getusersitepackages", lambda: None)()
+        if user_site:
+            dirs.append(user_site)
+        if hasattr(site, "getsitepackages"):
+            dirs.extend(d for d in site.getsitepackages() if d in sys.path)
+        return dirs
+
+    @staticmethod
+    def _cache_digest(sections):
+        return hashlib.sha1(
+            json.dumps(sections, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _load_disk_cache(self):
+        """Return the cached sections if the cache is current and intact."""
+        try:
+            data = json.loads(self._cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get("key") != self._cache_key():
+            return {}
+
+        sections = data.get("sections", {})
+        if data.get("digest") != self._cache_digest(sections):
+            return {}
+        return sections
+
+    def _read_disk_cache(self, section):
+        return self._load_disk_cache().get(section)
+
+    def _write_disk_cache(self, section, value):
+        sections = self._load_disk_cache()
+        sections[section] = value
+        payload = {
+            "key": self._cache_key(),
+            "digest": self._cache_digest(sections),
+            "sections": sections,
+        }
+        try:
+            self._cache_path.parent.mkdir(exist_ok=True)
+            self._cache_path.write_text(json.dumps(payload))
+        except OSError as e:
+            logger.debug(f"Could not write init cache: {e}")
+
+    def _invalidate_deps_cache(self):
+        """Forget dependency results after packages were installed."""
+        self._deps_cache = None
+        try:
+            self._cache_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Could not remove init cache: {e}")
+
     def get_python_info(self):
         """Get detailed Python environment information."""
         info = {
@@ -123,29 +384,75 @@ class NamecheapInitializer:
             "user_base": getattr(sys, "user_base", "Not available"),
         }
 
+        if self._pythons_cache is None:
+            self._pythons_cache = self._read_disk_cache("available_pythons")
+
+        if self._pythons_cache is not None:
+            info["available_pythons"] = self._pythons_cache
+            return info
+
+        import subprocess
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _probe(python_path):
+            try:
+                result = subprocess.run(
+                    [python_path, "--version"],
+                    capture_output=True,
+                    text=True,
+                    timeout=5,
+                )
+                if result.returncode == 0:
+                    return result.stdout.strip()
+            except Exception:
+                pass
+            return None
+
         # Try to find alternative Python installations
-        available_pythons = []
+        versions = {}
+        to_probe = []
         for python_path in self.possible_python_paths:
             if os.path.exists(python_path):
-                try:
-                    result = subprocess.run(
-                        [python_path, "--version"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5,
-                    )
-                    if result.returncode == 0:
-                        available_pythons.append(
-                            {"path": python_path, "version": result.stdout.strip()}
-                        )
-                except:
-                    pass
+                # Most installs symlink to a versioned binary, so read the
+                # version off the target name instead of spawning it
+                target = os.path.basename(os.path.realpath(python_path))
+                match = _PYTHON_VERSION_RE.search(target)
+                if match:
+                    versions[python_path] = f"Python {match.group(1)}"
+                else:
+                    to_probe.append(python_path)
+
+        # Spawn the remaining '--version' probes concurrently
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=len(to_probe)) as executor:
+                for python_path, version in zip(
+                    to_probe, executor.map(_probe, to_probe)
+                ):
+                    if version is not None:
+                        versions[python_path] = version
+
+        available_pythons = [
+            {"path": python_path, "version": versions[python_path]}
+            for python_path in self.possible_python_paths
+            if python_path in versions
+        ]
 
+        self._pythons_cache = available_pythons
+        self._write_disk_cache("available_pythons", available_pythons)
         info["available_pythons"] = available_pythons
         return info
 
     def check_dependencies(self):
         """Check and report on Python dependencies."""
+        if self._deps_cache is not None:
+            return self._deps_cache
+
+        cached = self._read_disk_cache("dependencies")
+        if cached is not None:
+            logger.info("Using cached dependency check results")
+            self._deps_cache = cached
+            return cached
+
         required_packages = [
             "flask",
             "requests",
@@ -165,30 +472,33 @@ class NamecheapInitializer:
 
         # Check required packages
         for package in required_packages:
-            try:
-                __import__(package)
+            if _module_available(package):
                 results["required"][package] = "Available"
                 logger.info(f"✓ Required package '{package}' is available")
-            except ImportError:
+            else:
                 results["required"][package] = "Missing"
                 results["missing_required"].append(package)
                 logger.error(f"✗ Required package '{package}' is missing")
 
         # Check optional packages
         for package in optional_packages:
-            try:
-                __import__(package.replace("-", "_"))
+            if _module_available(package.replace("-", "_")):
                 results["optional"][package] = "Available"
                 logger.info(f"✓ Optional package '{package}' is available")
-            except ImportError:
+            else:
                 results["optional"][package] = "Missing"
                 results["missing_optional"].append(package)
                 logger.warning(f"⚠ Optional package '{package}' is missing")
 
+        self._deps_cache = results
+        self._write_disk_cache("dependencies", results)
         return results
 
     def install_dependencies(self):
         """Attempt to install missing dependencies."""
+        import subprocess
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
         logger.info("Attempting to install missing dependencies...")
 
         dep_results = self.check_dependencies()
@@ -207,48 +517,96 @@ class NamecheapInitializer:
             ["python3", "-m", "pip", "install", "--user"],
         ]
 
-        success_count = 0
-
-        for pip_cmd in pip_commands:
+        # Probe once, then share the working pip command across workers
+        pip_cmd = None
+        for candidate in pip_commands:
             try:
                 # Test if pip command works
                 test_result = subprocess.run(
-                    pip_cmd + ["--version"], capture_output=True, text=True, timeout=10
+                    candidate + ["--version"],
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
                 )
-                if test_result.returncode != 0:
-                    continue
-
-                logger.info(f"Using pip command: {' '.join(pip_cmd)}")
-
-                # Install packages one by one
-                for package in missing_packages:
-                    try:
-                        logger.info(f"Installing {package}...")
-                        result = subprocess.run(
-                            pip_cmd + [package],
-                            capture_output=True,
-                            text=True,
-                            timeout=120,
-                        )
-
-                        if result.returncode == 0:
-                            logger.info(f"✓ Successfully installed {package}")
-                            success_count += 1
-                        else:
-                            logger.error(
-                                f"✗ Failed to install {package}: {result.stderr}"
-                            )
-
-                    except subprocess.TimeoutExpired:
-                        logger.error(f"✗ Timeout installing {package}")
-                    except Exception as e:
-                        logger.error(f"✗ Error installing {package}: {e}")
-
-                break  # If we got here, pip command worked
+                if test_result.returncode == 0:
+                    pip_cmd = candidate
+                    break
+            except Exception as e:
+                logger.warning(f"Pip command failed: {' '.join(candidate)}: {e}")
 
+        if pip_cmd is None:
+            logger.error("✗ No working pip command found")
+            logger.info(f"Successfully installed 0/{len(missing_packages)} packages")
+            return False
+
+        logger.info(f"Using pip command: {' '.join(pip_cmd)}")
+
+        def _install_one(package):
+            logger.info(f"Installing {package}...")
+            try:
+                result = subprocess.run(
+                    pip_cmd + [package],
+                    capture_output=True,
+                    text=True,
+                    timeout=120,
+                )
+                return package, result.returncode == 0, result.stderr
+            except subprocess.TimeoutExpired:
+                return package, False, "Timeout"
             except Exception as e:
-                logger.warning(f"Pip command failed: {' '.join(pip_cmd)}: {e}")
-                continue
+                return package, False, str(e)
+
+        # Let pip resolve and download the whole set in a single run
+        try:
+            logger.info(f"Installing {', '.join(missing_packages)}...")
+            result = subprocess.run(
+                pip_cmd + missing_packages,
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+            if result.returncode == 0:
+                self._invalidate_deps_cache()
+                for line in result.stdout.splitlines():
+                    if line.startswith("Successfully installed"):
+                        logger.info(f"✓ {line}")
+                logger.info(
+                    f"Successfully installed {len(missing_packages)}/"
+                    f"{len(missing_packages)} packages"
+                )
+                return True
+            logger.warning("Batch install failed, retrying packages individually")
+        except subprocess.TimeoutExpired:
+            logger.warning("Batch install timed out, retrying packages individually")
+        except Exception as e:
+            logger.warning(f"Batch install failed: {e}")
+
+        success_count = 0
+        failed_packages = []
+
+        # Install independent packages in parallel
+        with ThreadPoolExecutor(max_workers=min(len(missing_packages), 4)) as executor:
+            futures = [executor.submit(_install_one, p) for p in missing_packages]
+            for future in as_completed(futures):
+                package, ok, stderr = future.result()
+                if ok:
+                    logger.info(f"✓ Successfully installed {package}")
+                    success_count += 1
+                else:
+                    failed_packages.append(package)
+
+        if success_count:
+            self._invalidate_deps_cache()
+
+        # Retry failures serially in case they raced on a shared dependency
+        for package in failed_packages:
+            package, ok, stderr = _install_one(package)
+            if ok:
+                logger.info(f"✓ Successfully installed {package}")
+                self._invalidate_deps_cache()
+                success_count += 1
+            else:
+                logger.error(f"✗ Failed to install {package}: {stderr}")
 
         logger.info(
             f"Successfully installed {success_count}/{len(missing_packages)} packages"
@@ -257,8 +615,8 @@ class NamecheapInitializer:
 
     def setup_environment_file(self):
         """Setup .env file for Namecheap hosting."""
-        env_file = self.project_root / ".env"
-        env_example = self.project_root / ".env.example"
+        env_file = self._paths[".env"]
+        env_example = self._paths[".env.example"]
 
         if env_file.exists():
             logger.info(".env file already exists")
@@ -278,9 +636,16 @@ LOG_LEVEL=INFO
             with open(env_example, "r") as f:
                 env_content = f.read()
 
-            # Customize for Namecheap
-            env_content = env_content.replace("USE_LOCAL=true", "USE_LOCAL=false")
-            env_content = env_content.replace("DEBUG=true", "DEBUG=false")
+            # Customize for Namecheap in a single pass over the lines
+            lines = []
+            for line in env_content.splitlines():
+                if line.startswith("USE_LOCAL="):
+                    lines.append("USE_LOCAL=false")
+                elif line.startswith("DEBUG="):
+                    lines.append("DEBUG=false")
+                else:
+                    lines.append(line)
+            env_content = "\n".join(lines) + "\n"
 
         try:
             with open(env_file, "w") as f:
@@ -299,10 +664,10 @@ LOG_LEVEL=INFO
     def create_directory_structure(self):
         """Create necessary directories for Namecheap deployment."""
         directories = [
-            self.project_root / "logs",
-            self.project_root / "tmp",
-            self.project_root / "static",
-            self.project_root / "templates",
+            self._paths["logs"],
+            self._paths["tmp"],
+            self._paths["static"],
+            self._paths["templates"],
         ]
 
         created_dirs = []
@@ -317,11 +682,12 @@ LOG_LEVEL=INFO
             except Exception as e:
                 logger.error(f"✗ Failed to create directory {directory}: {e}")
 
+        self._entries = None
         return created_dirs
 
     def setup_wsgi_configuration(self):
         """Ensure proper WSGI configuration for Namecheap."""
-        passenger_wsgi = self.project_root / "passenger_wsgi.py"
+        passenger_wsgi = self._paths["passenger_wsgi.py"]
 
         if not passenger_wsgi.exists():
             logger.error("passenger_wsgi.py not found!")
@@ -336,8 +702,8 @@ LOG_LEVEL=INFO
 
         # Test import of the WSGI file
         try:
-            sys.path.insert(0, str(self.project_root))
-            import passenger_wsgi
+            _ensure_on_path(self.project_root)
+            passenger_wsgi = _safe_import("passenger_wsgi")
 
             if hasattr(passenger_wsgi, "application"):
                 logger.info("✓ passenger_wsgi.py imports successfully")
@@ -349,9 +715,66 @@ LOG_LEVEL=INFO
             logger.error(f"✗ Failed to import passenger_wsgi.py: {e}")
             return False
 
+    def _post_claude_probe(self, body, headers):
+        """POST to the Claude messages endpoint over a reused connection."""
+        cls = type(self)
+
+        if cls._claude_pool is None:
+            try:
+                import urllib3
+
+                cls._claude_pool = urllib3.PoolManager(
+                    maxsize=2, ssl_context=_get_ssl_context()
+                )
+            except ImportError:
+                cls._claude_pool = False
+
+        if cls._claude_pool:
+            response = cls._claude_pool.request(
+                "POST",
+                f"https://{CLAUDE_API_HOST}/v1/messages",
+                body=body,
+                headers=headers,
+                timeout=10,
+                retries=False,
+            )
+            return response.status
+
+        # Fall back to one long-lived connection per process
+        if cls._claude_conn is None:
+            import http.client
+
+            cls._claude_conn = http.client.HTTPSConnection(
+                CLAUDE_API_HOST, context=_get_ssl_context(), timeout=10
+            )
+        conn = cls._claude_conn
+
+        try:
+            conn.request("POST", "/v1/messages", body, headers)
+            response = conn.getresponse()
+            response.read()
+        except Exception:
+            conn.close()
+            raise
+        return response.status
+
+    def _claude_api_key(self):
+        """Return CLAUDE_API_KEY from the environment, falling back to .env."""
+        api_key = os.environ.get("CLAUDE_API_KEY")
+        if api_key:
+            return api_key
+
+        _ensure_on_path(self.project_root)
+        from env_loader import parse_env_file
+
+        try:
+            return parse_env_file(self._paths[".env"]).get("CLAUDE_API_KEY")
+        except FileNotFoundError:
+            return None
+
     def test_claude_api_connection(self):
         """Test connection to Claude API if key is configured."""
-        api_key = os.environ.get("CLAUDE_API_KEY")
+        api_key = self._claude_api_key()
 
         if not api_key or api_key == "your-claude-api-key-here":
             logger.warning("Claude API key not configured - skipping connection test")
@@ -360,11 +783,6 @@ LOG_LEVEL=INFO
         logger.info("Testing Claude API connection...")
 
         try:
-            # Create a simple test request
-            import json
-            import urllib.request
-
-            url = "https://api.anthropic.com/v1/messages"
             headers = {
                 "x-api-key": api_key,
                 "anthropic-version": "2023-06-01",
@@ -377,22 +795,14 @@ LOG_LEVEL=INFO
                 "messages": [{"role": "user", "content": "Hello"}],
             }
 
-            request = urllib.request.Request(
-                url, data=json.dumps(data).encode("utf-8"), headers=headers
-            )
-
-            # Create SSL context that doesn't verify certificates (for some hosting environments)
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
+            status = self._post_claude_probe(json.dumps(data).encode("utf-8"), headers)
 
-            with urllib.request.urlopen(request, timeout=10, context=ctx) as response:
-                if response.status == 200:
-                    logger.info("✓ Claude API connection successful")
-                    return True
-                else:
-                    logger.error(f"✗ Claude API returned status {response.status}")
-                    return False
+            if status == 200:
+                logger.info("✓ Claude API connection successful")
+                return True
+            else:
+                logger.error(f"✗ Claude API returned status {status}")
+                return False
 
         except Exception as e:
             logger.error(f"✗ Claude API connection failed: {e}")
@@ -405,22 +815,19 @@ LOG_LEVEL=INFO
         checks = {
             "python_version": sys.version_info >= (3, 8),
             "project_structure": all(
-                [
-                    (self.project_root / "app.py").exists(),
-                    (self.project_root / "passenger_wsgi.py").exists(),
-                    (self.project_root / "requirements.txt").exists(),
-                ]
+                name in self._project_entries()
+                for name in ("app.py", "passenger_wsgi.py", "requirements.txt")
             ),
             "dependencies": len(self.check_dependencies()["missing_required"]) == 0,
-            "environment": (self.project_root / ".env").exists(),
+            "environment": ".env" in self._project_entries(),
             "wsgi_config": self.setup_wsgi_configuration(),
             "directories": len(self.create_directory_structure()) > 0,
         }
 
         # Test app import
         try:
-            sys.path.insert(0, str(self.project_root))
-            import app
+            _ensure_on_path(self.project_root)
+            _safe_import("app")
 
             checks["app_import"] = True
             logger.info("✓ Main application imports successfully")
@@ -434,8 +841,10 @@ LOG_LEVEL=INFO
             checks["claude_api"] = claude_test
 
         # Summary
-        passed = sum(1 for result in checks.values() if result is True)
-        total = len(checks)
+        # Count identity with True so non-bool truthy results don't pass
+        results = list(checks.values())
+        total = len(results)
+        passed = sum(1 for result in results if result is True)
 
         logger.info(f"Health check results: {passed}/{total} checks passed")
 
@@ -447,6 +856,7 @@ LOG_LEVEL=INFO
 
     def generate_debug_report(self):
         """Generate comprehensive debug report for troubleshooting."""
+        entries = self._project_entries()
         report = {
             "timestamp": datetime.now().isoformat(),
             "namecheap_detection": self.is_namecheap,
@@ -458,36 +868,52 @@ LOG_LEVEL=INFO
             },
             "python_info": self.get_python_info(),
             "dependencies": self.check_dependencies(),
-            "environment_variables": {
-                k: v if "KEY" not in k and "SECRET" not in k else "***HIDDEN***"
-                for k, v in os.environ.items()
-                if k.startswith(("FLASK_", "CLAUDE_", "USE_", "DEBUG", "SECRET"))
-            },
+            "environment_variables": {},
             "file_structure": {
-                "app.py": (self.project_root / "app.py").exists(),
-                "passenger_wsgi.py": (self.project_root / "passenger_wsgi.py").exists(),
-                "requirements.txt": (self.project_root / "requirements.txt").exists(),
-                ".env": (self.project_root / ".env").exists(),
-                ".env.example": (self.project_root / ".env.example").exists(),
-                "templates/": (self.project_root / "templates").exists(),
-                "static/": (self.project_root / "static").exists(),
+                "app.py": "app.py" in entries,
+                "passenger_wsgi.py": "passenger_wsgi.py" in entries,
+                "requirements.txt": "requirements.txt" in entries,
+                ".env": ".env" in entries,
+                ".env.example": ".env.example" in entries,
+                "templates/": self._has_dir("templates"),
+                "static/": self._has_dir("static"),
             },
             "permissions": {},
         }
 
+        # Collect relevant environment variables, masking secrets
+        for k, v in os.environ.items():
+            if not k.startswith(_ENV_PREFIXES):
+                continue
+            masked = "***HIDDEN***" if _SECRET_RE.search(k) else v
+            report["environment_variables"][k] = masked
+
         # Check file permissions
         important_files = ["app.py", "passenger_wsgi.py", ".env"]
         for filename in important_files:
-            filepath = self.project_root / filename
-            if filepath.exists():
+            entry = entries.get(filename)
+            if entry is not None:
                 try:
-                    stat = filepath.stat()
+                    stat = entry.stat()
                     report["permissions"][filename] = oct(stat.st_mode)
                 except:
                     report["permissions"][filename] = "Unable to read"
 
         return report
 
+    def _ensure_mode(self, path, perm):
+        """chmod a path only if its mode differs; returns True if changed."""
+        try:
+            current = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            return False
+
+        if current == perm:
+            return False
+
+        os.chmod(path, perm)
+        return True
+
     def fix_common_issues(self):
         """Fix common Namecheap hosting issues."""
         logger.info("Fixing common Namecheap hosting issues...")
@@ -496,34 +922,25 @@ LOG_LEVEL=INFO
 
         # Fix 1: File permissions
         try:
-            important_files = [
-                ("passenger_wsgi.py", 0o755),
-                ("app.py", 0o644),
-                (".env", 0o600),
-            ]
-
-            for filename, perm in important_files:
-                filepath = self.project_root / filename
-                if filepath.exists():
-                    os.chmod(filepath, perm)
+            for filename, perm in self._IMPORTANT_FILES:
+                filepath = self._paths[filename]
+                if self._ensure_mode(filepath, perm):
                     fixes_applied.append(f"Set permissions for {filename}")
         except Exception as e:
             logger.error(f"Failed to fix file permissions: {e}")
 
         # Fix 2: Directory permissions
         try:
-            dirs = ["logs", "tmp", "static", "templates"]
-            for dirname in dirs:
-                dirpath = self.project_root / dirname
-                if dirpath.exists():
-                    os.chmod(dirpath, 0o755)
+            for dirname in self._PROJECT_DIRS:
+                dirpath = self._paths[dirname]
+                if self._ensure_mode(dirpath, 0o755):
                     fixes_applied.append(f"Set directory permissions for {dirname}")
         except Exception as e:
             logger.error(f"Failed to fix directory permissions: {e}")
 
         # Fix 3: Python path in passenger_wsgi.py
         try:
-            passenger_file = self.project_root / "passenger_wsgi.py"
+            passenger_file = self._paths["passenger_wsgi.py"]
             if passenger_file.exists():
                 content = passenger_file.read_text()
                 if str(self.project_root) not in content:
@@ -539,7 +956,7 @@ LOG_LEVEL=INFO
         missing_dirs = []
         required_dirs = ["logs", "tmp"]
         for dirname in required_dirs:
-            dirpath = self.project_root / dirname
+            dirpath = self._paths[dirname]
             if not dirpath.exists():
                 try:
                     dirpath.mkdir(parents=True, exist_ok=True)
@@ -559,6 +976,76 @@ LOG_LEVEL=INFO
 
         return fixes_applied
 
+    def _run_step(self, step_name, step_func):
+        """Run one initialization step, logging and returning its result."""
+        logger.info(f"\n--- {step_name} ---")
+        try:
+            result = step_func()
+        except Exception as e:
+            logger.error(f"✗ {step_name}: FAILED - {e}")
+            return False
+
+        if result:
+            logger.info(f"✓ {step_name}: SUCCESS")
+        else:
+            logger.warning(f"⚠ {step_name}: PARTIAL or SKIPPED")
+        return result
+
+    def _run_step_graph(self, steps, max_workers=4):
+        """Run steps as soon as their dependencies finish, in parallel if possible."""
+        done = {}
+
+        try:
+            from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        except ImportError:
+            # No thread support: steps are declared in dependency order
+            for key, (step_name, step_func, _) in steps.items():
+                done[key] = self._run_step(step_name, step_func)
+            return done
+
+        pending = dict(steps)
+        running = {}
+
+        # Hold back each step's log records and write them as one block when
+        # the step finishes, so output from parallel steps doesn't interleave.
+        # Importing passenger_wsgi logs through its own logger, so cover it too.
+        log_buffer = _StepLogBuffer()
+        buffered_loggers = [logger, logging.getLogger("passenger_wsgi")]
+        for buffered_logger in buffered_loggers:
+            buffered_logger.addFilter(log_buffer)
+
+        def run_buffered(step_name, step_func):
+            log_buffer.start()
+            try:
+                return self._run_step(step_name, step_func)
+            finally:
+                log_buffer.release()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                while pending or running:
+                    ready = [
+                        key
+                        for key, (_, _, deps) in pending.items()
+                        if all(dep in done for dep in deps)
+                    ]
+                    for key in ready:
+                        step_name, step_func, _ = pending.pop(key)
+                        future = executor.submit(run_buffered, step_name, step_func)
+                        running[future] = key
+
+                    if not running:
+                        break
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done[running.pop(future)] = future.result()
+        finally:
+            for buffered_logger in buffered_loggers:
+                buffered_logger.removeFilter(log_buffer)
+
+        return done
+
     def full_initialization(self):
         """Run complete initialization process."""
         logger.info("=" * 60)
@@ -568,38 +1055,50 @@ LOG_LEVEL=INFO
         success_count = 0
         total_steps = 8
 
-        steps = [
-            ("Detecting hosting environment", lambda: self.is_namecheap),
-            (
+        # key: (step name, function, keys of steps it must wait for)
+        steps = {
+            "detect": ("Detecting hosting environment", lambda: self.is_namecheap, []),
+            "dirs": (
                 "Creating directory structure",
                 lambda: len(self.create_directory_structure()) > 0,
+                [],
             ),
-            ("Setting up environment file", self.setup_environment_file),
-            ("Installing dependencies", self.install_dependencies),
-            ("Setting up WSGI configuration", self.setup_wsgi_configuration),
-            (
+            "env": ("Setting up environment file", self.setup_environment_file, []),
+            "deps": ("Installing dependencies", self.install_dependencies, []),
+            # Importing passenger_wsgi needs the packages and loads .env
+            "wsgi": (
+                "Setting up WSGI configuration",
+                self.setup_wsgi_configuration,
+                ["deps", "env"],
+            ),
+            # Reads the API key from .env itself, so it overlaps the pip install
+            "api": (
                 "Testing Claude API connection",
                 lambda: self.test_claude_api_connection() is not False,
+                ["env"],
             ),
-            ("Running health check", lambda: self.run_health_check()[1]),
-            ("Applying common fixes", lambda: len(self.fix_common_issues()) >= 0),
-        ]
+            # The health check reuses the Claude connection, so wait for "api"
+            "health": (
+                "Running health check",
+                lambda: self.run_health_check()[1],
+                ["dirs", "deps", "wsgi", "api"],
+            ),
+            # Fixes touch files the other steps create or check, so run last
+            "fix": (
+                "Applying common fixes",
+                lambda: len(self.fix_common_issues()) >= 0,
+                ["detect", "dirs", "env", "deps", "wsgi", "api", "health"],
+            ),
+        }
+
+        outcomes = self._run_step_graph(steps)
 
         results = {}
 
-        for step_name, step_func in steps:
-            logger.info(f"\n--- {step_name} ---")
-            try:
-                result = step_func()
-                results[step_name] = result
-                if result:
-                    logger.info(f"✓ {step_name}: SUCCESS")
-                    success_count += 1
-                else:
-                    logger.warning(f"⚠ {step_name}: PARTIAL or SKIPPED")
-            except Exception as e:
-                logger.error(f"✗ {step_name}: FAILED - {e}")
-                results[step_name] = False
+        for key, (step_name, _, _) in steps.items():
+            results[step_name] = outcomes[key]
+            if outcomes[key]:
+                success_count += 1
 
         # Final summary
         logger.info("\n" + "=" * 60)
@@ -623,6 +1122,8 @@ LOG_LEVEL=INFO
 
 def main():
     """Main function with command line argument handling."""
+    import argparse
+
     parser = argparse.ArgumentParser(description="ShAI Namecheap Initialization Script")
     parser.add_argument("--verify", action="store_true", help="Verify setup only")
     parser.add_argument("--debug", action="store_true", help="Show debug information")
@@ -635,7 +1136,8 @@ def main():
     if args.debug:
         print("=== ShAI Namecheap Debug Report ===")
         report = initializer.generate_debug_report()
-        print(json.dumps(report, indent=2, default=str))
+        json.dump(report, sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
 
     elif args.verify:
         print("=== Verifying ShAI Setup ===")
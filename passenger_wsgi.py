@@ -16,18 +16,28 @@ Features:
 import sys
 import os
 import logging
+import functools
+import threading
+import time
 from pathlib import Path
 import traceback
 import json
 from datetime import datetime
 
 # Get the project directory
-PROJECT_HOME = Path(__file__).parent.absolute()
-sys.path.insert(0, str(PROJECT_HOME))
+# Plain strings on the import path; PROJECT_HOME stays a Path for callers
+_PROJECT_HOME = os.path.dirname(os.path.abspath(__file__))
+PROJECT_HOME = Path(_PROJECT_HOME)
+sys.path.insert(0, _PROJECT_HOME)
+
+from env_loader import parse_env_file
+from jsonutil import JSON_BACKEND, dumps
+from log_handlers import BufferedFileHandler
 
 # Configure logging with ASCII-only formatting to avoid encoding issues
-LOG_DIR = PROJECT_HOME / "logs"
-LOG_DIR.mkdir(exist_ok=True)
+_LOG_DIR = os.path.join(_PROJECT_HOME, "logs")
+os.makedirs(_LOG_DIR, exist_ok=True)
+LOG_DIR = Path(_LOG_DIR)
 
 
 # Create a custom formatter that avoids Unicode issues
@@ -35,6 +45,9 @@ class ASCIIFormatter(logging.Formatter):
     def format(self, record):
         # Replace any Unicode characters that might cause issues
         msg = super().format(record)
+        # Almost every record is already ASCII, so skip the re-encode for those
+        if msg.isascii():
+            return msg
         # Convert to ASCII, ignoring problematic characters
         return msg.encode("ascii", errors="ignore").decode("ascii")
 
@@ -44,7 +57,9 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 # File handler
-file_handler = logging.FileHandler(LOG_DIR / "passenger_wsgi.log")
+file_handler = BufferedFileHandler(
+    os.path.join(_LOG_DIR, "passenger_wsgi.log"), delay=True
+)
 file_handler.setLevel(logging.INFO)
 file_formatter = ASCIIFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 file_handler.setFormatter(file_formatter)
@@ -58,6 +73,21 @@ console_handler.setFormatter(console_formatter)
 logger.addHandler(file_handler)
 logger.addHandler(console_handler)
 
+# Short-lived cache of serialized /health and /debug bodies, so dashboards
+# polling these endpoints don't rebuild the payload on every request
+_HEALTH_CACHE_TTL = 2.0
+_DEBUG_CACHE_TTL = 1.0
+_HEALTH_CACHE = {"t": 0.0, "status": "", "body": b""}
+_DEBUG_CACHE = {"t": 0.0, "body": b""}
+_response_cache_lock = threading.Lock()
+
+# Steady-state /health body; only the variable fields are filled in per build
+_HEALTHY_BODY_TEMPLATE = (
+    b'{"status":"healthy","message":"Application ready",'
+    b'"missing_dependencies":[],"available_dependencies":%s,'
+    b'"environment":%s,"timestamp":"%s","claude_configured":%s}'
+)
+
 
 def setup_environment():
     """Setup environment variables for production deployment."""
@@ -69,22 +99,20 @@ def setup_environment():
     os.environ.setdefault("USE_LOCAL", "false")
 
     # Load environment variables from .env file if it exists
-    env_file = PROJECT_HOME / ".env"
-    if env_file.exists():
-        logger.info("Loading environment from .env file")
-        try:
-            with open(env_file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#") and "=" in line:
-                        key, value = line.split("=", 1)
-                        if key not in os.environ:
-                            os.environ[key] = value.strip("\"'")
-                            logger.info("Loaded environment variable: %s", key)
-        except Exception as e:
-            logger.error("Error loading .env file: %s", str(e))
-    else:
+    env_file = os.path.join(_PROJECT_HOME, ".env")
+    try:
+        env_vars = parse_env_file(env_file)
+    except FileNotFoundError:
         logger.warning(".env file not found - relying on hosting provider environment")
+    except Exception as e:
+        logger.error("Error loading .env file: %s", str(e))
+    else:
+        logger.info("Loading environment from .env file")
+        loaded = [key for key in env_vars if key not in os.environ]
+        for key in loaded:
+            os.environ[key] = env_vars[key]
+        if loaded:
+            logger.info("Loaded env vars: %s", ", ".join(loaded))
 
     # Ensure critical environment variables are set
     required_vars = {
@@ -99,8 +127,13 @@ def setup_environment():
             logger.warning("Set default value for %s", var)
 
 
+@functools.lru_cache(maxsize=1)
 def check_dependencies():
-    """Check if all required dependencies are available."""
+    """Check if all required dependencies are available.
+
+    The result is cached for the life of the worker; returns tuples so the
+    shared cached value can't be mutated by callers.
+    """
     required_modules = ["flask", "requests"]
     missing_modules = []
     available_modules = []
@@ -114,7 +147,7 @@ def check_dependencies():
             missing_modules.append(module)
             logger.error("Module %s is missing", module)
 
-    return missing_modules, available_modules
+    return tuple(missing_modules), tuple(available_modules)
 
 
 def create_minimal_wsgi_app():
@@ -139,22 +172,41 @@ def create_minimal_wsgi_app():
 
 def handle_health(environ, start_response):
     """Handle health check endpoint."""
-    missing_deps, available_deps = check_dependencies()
-
-    health_data = {
-        "status": "error" if missing_deps else "healthy",
-        "message": "Missing dependencies" if missing_deps else "Application ready",
-        "missing_dependencies": missing_deps,
-        "available_dependencies": available_deps,
-        "environment": os.environ.get("FLASK_ENV"),
-        "timestamp": datetime.now().isoformat(),
-        "claude_configured": bool(os.environ.get("CLAUDE_API_KEY"))
-        and os.environ.get("CLAUDE_API_KEY") != "your-claude-api-key-here",
-    }
+    with _response_cache_lock:
+        now = time.monotonic()
+        if not _HEALTH_CACHE["body"] or now - _HEALTH_CACHE["t"] >= _HEALTH_CACHE_TTL:
+            missing_deps, available_deps = check_dependencies()
+            claude_key = os.environ.get("CLAUDE_API_KEY")
+            claude_configured = (
+                bool(claude_key) and claude_key != "your-claude-api-key-here"
+            )
 
-    response_body = json.dumps(health_data, indent=2).encode("utf-8")
+            if not missing_deps:
+                # Fast path: fill the prebuilt template instead of serializing
+                _HEALTH_CACHE["body"] = _HEALTHY_BODY_TEMPLATE % (
+                    json.dumps(available_deps).encode("utf-8"),
+                    json.dumps(os.environ.get("FLASK_ENV")).encode("utf-8"),
+                    datetime.now().isoformat().encode("ascii"),
+                    b"true" if claude_configured else b"false",
+                )
+                _HEALTH_CACHE["status"] = "200 OK"
+            else:
+                health_data = {
+                    "status": "error",
+                    "message": "Missing dependencies",
+                    "missing_dependencies": missing_deps,
+                    "available_dependencies": available_deps,
+                    "environment": os.environ.get("FLASK_ENV"),
+                    "timestamp": datetime.now().isoformat(),
+                    "claude_configured": claude_configured,
+                }
+                _HEALTH_CACHE["body"] = dumps(health_data, indent=True)
+                _HEALTH_CACHE["status"] = "500 Internal Server Error"
+            _HEALTH_CACHE["t"] = now
+
+        status = _HEALTH_CACHE["status"]
+        response_body = _HEALTH_CACHE["body"]
 
-    status = "500 Internal Server Error" if missing_deps else "200 OK"
     headers = [
         ("Content-Type", "application/json"),
         ("Content-Length", str(len(response_body))),
@@ -164,26 +216,52 @@ def handle_health(environ, start_response):
     return [response_body]
 
 
+# Environment variable prefixes exposed (masked if secret) by /debug
+_PREFIXES = ("FLASK_", "CLAUDE_", "USE_", "DEBUG", "SECRET")
+_debug_env_memo = {"sig": None, "keys": ()}
+
+
+def _debug_env_keys():
+    """Return the os.environ keys /debug reports, rescanning only on change."""
+    sig = (len(os.environ), sum(map(hash, os.environ.keys())))
+    if sig != _debug_env_memo["sig"]:
+        _debug_env_memo["keys"] = tuple(
+            k for k in os.environ if k.startswith(_PREFIXES)
+        )
+        _debug_env_memo["sig"] = sig
+    return _debug_env_memo["keys"]
+
+
 def handle_debug(environ, start_response):
     """Handle debug information endpoint."""
-    missing_deps, available_deps = check_dependencies()
+    with _response_cache_lock:
+        now = time.monotonic()
+        if not _DEBUG_CACHE["body"] or now - _DEBUG_CACHE["t"] >= _DEBUG_CACHE_TTL:
+            missing_deps, available_deps = check_dependencies()
+
+            debug_info = {
+                "python_version": sys.version,
+                "python_executable": sys.executable,
+                "project_home": _PROJECT_HOME,
+                "environment_vars": {
+                    k: (
+                        os.environ[k]
+                        if "KEY" not in k and "SECRET" not in k
+                        else "***HIDDEN***"
+                    )
+                    for k in _debug_env_keys()
+                },
+                "missing_dependencies": missing_deps,
+                "available_dependencies": available_deps,
+                "python_path": sys.path[:5],
+                "json_backend": JSON_BACKEND,
+                "timestamp": datetime.now().isoformat(),
+            }
 
-    debug_info = {
-        "python_version": sys.version,
-        "python_executable": sys.executable,
-        "project_home": str(PROJECT_HOME),
-        "environment_vars": {
-            k: v if "KEY" not in k and "SECRET" not in k else "***HIDDEN***"
-            for k, v in os.environ.items()
-            if k.startswith(("FLASK_", "CLAUDE_", "USE_", "DEBUG", "SECRET"))
-        },
-        "missing_dependencies": missing_deps,
-        "available_dependencies": available_deps,
-        "python_path": sys.path[:5],
-        "timestamp": datetime.now().isoformat(),
-    }
+            _DEBUG_CACHE["body"] = dumps(debug_info, indent=True)
+            _DEBUG_CACHE["t"] = now
 
-    response_body = json.dumps(debug_info, indent=2).encode("utf-8")
+        response_body = _DEBUG_CACHE["body"]
 
     headers = [
         ("Content-Type", "application/json"),
@@ -194,27 +272,23 @@ def handle_debug(environ, start_response):
     return [response_body]
 
 
-def handle_error_page(environ, start_response):
-    """Handle main error page display."""
-    missing_deps, available_deps = check_dependencies()
-
-    # Create a comprehensive error page
-    error_html = f"""<!DOCTYPE html>
+# Static parts of the error page, encoded once at import
+_ERROR_PAGE_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ShAI - Initialization Error</title>
     <style>
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             margin: 0;
             padding: 20px;
             min-height: 100vh;
-        }}
-        .container {{
+        }
+        .container {
             background: rgba(255,255,255,0.1);
             backdrop-filter: blur(10px);
             border-radius: 15px;
@@ -222,56 +296,56 @@ def handle_error_page(environ, start_response):
             max-width: 800px;
             margin: 0 auto;
             box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-        }}
-        .logo {{
+        }
+        .logo {
             font-size: 3rem;
             font-weight: bold;
             margin-bottom: 20px;
             text-align: center;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        .error {{
+        }
+        .error {
             background: rgba(255,0,0,0.2);
             border: 1px solid rgba(255,0,0,0.3);
             color: #ffcccc;
             padding: 20px;
             border-radius: 10px;
             margin: 20px 0;
-        }}
-        .info {{
+        }
+        .info {
             background: rgba(0,255,255,0.2);
             border: 1px solid rgba(0,255,255,0.3);
             color: #ccffff;
             padding: 20px;
             border-radius: 10px;
             margin: 20px 0;
-        }}
-        .success {{
+        }
+        .success {
             background: rgba(0,255,0,0.2);
             border: 1px solid rgba(0,255,0,0.3);
             color: #ccffcc;
             padding: 20px;
             border-radius: 10px;
             margin: 20px 0;
-        }}
-        .code {{
+        }
+        .code {
             background: rgba(0,0,0,0.3);
             padding: 15px;
             border-radius: 5px;
             font-family: monospace;
             overflow-x: auto;
             margin: 10px 0;
-        }}
-        .timestamp {{
+        }
+        .timestamp {
             text-align: center;
             font-size: 0.8em;
             opacity: 0.7;
             margin-top: 20px;
-        }}
-        ul, ol {{
+        }
+        ul, ol {
             text-align: left;
-        }}
-        .btn {{
+        }
+        .btn {
             display: inline-block;
             background: rgba(255,255,255,0.2);
             color: white;
@@ -280,23 +354,32 @@ def handle_error_page(environ, start_response):
             text-decoration: none;
             margin: 5px;
             border: 1px solid rgba(255,255,255,0.3);
-        }}
-        .btn:hover {{
+        }
+        .btn:hover {
             background: rgba(255,255,255,0.3);
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <div class="logo">ShAI</div>
         <h1>Application Initialization Status</h1>
+""".encode("utf-8")
 
-        {"<div class='error'>" if missing_deps else "<div class='success'>"}
-            <h3>{"Dependencies Missing" if missing_deps else "Dependencies Check Passed"}</h3>
-            {"<p>The following Python packages are required but not installed:</p>" if missing_deps else "<p>All required dependencies are available.</p>"}
-            {f"<div class='code'>{', '.join(missing_deps)}</div>" if missing_deps else ""}
-        </div>
+_ERROR_PAGE_TAIL = b"""    </div>
+</body>
+</html>"""
 
+
+def _render_system_info(available_deps):
+    """Render the available-dependencies and system information blocks."""
+    claude_key = os.environ.get("CLAUDE_API_KEY")
+    claude_status = (
+        "Configured"
+        if claude_key and claude_key != "your-claude-api-key-here"
+        else "Not configured"
+    )
+    return f"""
         {f"<div class='success'><h4>Available Dependencies:</h4><div class='code'>{', '.join(available_deps)}</div></div>" if available_deps else ""}
 
         <div class="info">
@@ -305,19 +388,15 @@ def handle_error_page(environ, start_response):
                 <li><strong>Python Version:</strong> {sys.version.split()[0]}</li>
                 <li><strong>Project Path:</strong> {PROJECT_HOME}</li>
                 <li><strong>Environment:</strong> {os.environ.get("FLASK_ENV", "unknown")}</li>
-                <li><strong>Claude API:</strong> {"Configured" if os.environ.get("CLAUDE_API_KEY") and os.environ.get("CLAUDE_API_KEY") != "your-claude-api-key-here" else "Not configured"}</li>
+                <li><strong>Claude API:</strong> {claude_status}</li>
             </ul>
         </div>
+"""
 
-        {"<div class='info'>" if missing_deps else ""}
-            {"<h4>Installation Instructions:</h4>" if missing_deps else ""}
-            {"<ol>" if missing_deps else ""}
-                {"<li><strong>SSH/Terminal Method:</strong><div class='code'>pip install --user flask requests gunicorn</div></li>" if missing_deps else ""}
-                {"<li><strong>cPanel Method:</strong><br>Go to 'Python Selector' → Select your app → 'Packages' → Install: flask, requests</li>" if missing_deps else ""}
-                {"<li><strong>Upload Method:</strong><br>Upload requirements.txt and use hosting control panel to install packages</li>" if missing_deps else ""}
-            {"</ol>" if missing_deps else ""}
-        {"</div>" if missing_deps else ""}
 
+def _render_footer():
+    """Render the quick actions and the status timestamp."""
+    return f"""
         <div class="info">
             <h4>Quick Actions:</h4>
             <a href="/health" class="btn">Health Check (JSON)</a>
@@ -328,20 +407,76 @@ def handle_error_page(environ, start_response):
         <div class="timestamp">
             Status checked at: {datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")}
         </div>
-    </div>
-</body>
-</html>"""
+"""
 
-    response_body = error_html.encode("utf-8")
 
-    headers = [
-        ("Content-Type", "text/html"),
-        ("Content-Length", str(len(response_body))),
-    ]
+# Rendered status section for the healthy page, rebuilt at most once a minute
+_OK_PAGE_TTL = 60.0
+_OK_PAGE_CACHE = {"t": 0.0, "body": b""}
+
+
+def _render_ok(available_deps):
+    """Return the cached status section shown when all dependencies exist."""
+    with _response_cache_lock:
+        now = time.monotonic()
+        if not _OK_PAGE_CACHE["body"] or now - _OK_PAGE_CACHE["t"] >= _OK_PAGE_TTL:
+            html = """
+        <div class='success'>
+            <h3>Dependencies Check Passed</h3>
+            <p>All required dependencies are available.</p>
+        </div>
+""" + _render_system_info(available_deps) + _render_footer()
+            _OK_PAGE_CACHE["body"] = html.encode("utf-8")
+            _OK_PAGE_CACHE["t"] = now
+        return _OK_PAGE_CACHE["body"]
+
+
+def _render_missing(missing_deps, available_deps):
+    """Render the status section with install instructions for missing deps."""
+    html = (
+        f"""
+        <div class='error'>
+            <h3>Dependencies Missing</h3>
+            <p>The following Python packages are required but not installed:</p>
+            <div class='code'>{', '.join(missing_deps)}</div>
+        </div>
+"""
+        + _render_system_info(available_deps)
+        + """
+        <div class='info'>
+            <h4>Installation Instructions:</h4>
+            <ol>
+                <li><strong>SSH/Terminal Method:</strong><div class='code'>pip install --user flask requests gunicorn</div></li>
+                <li><strong>cPanel Method:</strong><br>Go to 'Python Selector' → Select your app → 'Packages' → Install: flask, requests</li>
+                <li><strong>Upload Method:</strong><br>Upload requirements.txt and use hosting control panel to install packages</li>
+            </ol>
+        </div>
+"""
+        + _render_footer()
+    )
+    return html.encode("utf-8")
+
+
+def _iter_error_page(missing_deps, available_deps):
+    """Yield the error page in chunks so the static head goes out first."""
+    yield _ERROR_PAGE_HEAD
+    if missing_deps:
+        yield _render_missing(missing_deps, available_deps)
+    else:
+        yield _render_ok(available_deps)
+    yield _ERROR_PAGE_TAIL
+
+
+def handle_error_page(environ, start_response):
+    """Handle main error page display."""
+    missing_deps, available_deps = check_dependencies()
+
+    # No Content-Length: the body is streamed and the server frames it
+    headers = [("Content-Type", "text/html")]
 
     status = "500 Internal Server Error" if missing_deps else "200 OK"
     start_response(status, headers)
-    return [response_body]
+    return _iter_error_page(missing_deps, available_deps)
 
 
 def initialize_main_app():
@@ -375,13 +510,19 @@ def initialize_main_app():
         else:
             logger.info("CLAUDE_API_KEY is configured")
 
-        # Test a simple route to ensure app is working
-        with main_app.test_client() as client:
-            response = client.get("/health")
-            if response.status_code == 200:
-                logger.info("Main application health check passed")
-            else:
-                logger.warning("Health check returned status %d", response.status_code)
+        # Running a full request on every worker boot is expensive, so the
+        # in-process /health self-test is opt-in via WSGI_SELFTEST=1
+        if os.environ.get("WSGI_SELFTEST") == "1":
+            with main_app.test_client() as client:
+                response = client.get("/health")
+                if response.status_code == 200:
+                    logger.info("Main application health check passed")
+                else:
+                    logger.warning(
+                        "Health check returned status %d", response.status_code
+                    )
+        elif not callable(getattr(main_app, "wsgi_app", None)):
+            raise RuntimeError("Main application is not a valid WSGI app")
 
         logger.info("Main ShAI application initialized successfully")
         return main_app
@@ -389,17 +530,26 @@ def initialize_main_app():
     except Exception as e:
         logger.error("Failed to initialize main application: %s", str(e))
         logger.error("Traceback: %s", traceback.format_exc())
+        # Re-probe dependencies next time in case they've been fixed
+        check_dependencies.cache_clear()
         raise
 
 
 def auto_initialize():
     """Auto-initialize the application with comprehensive error handling."""
-    logger.info("=" * 60)
-    logger.info("ShAI Passenger WSGI Auto-Initialization Starting...")
-    logger.info("Project Home: %s", PROJECT_HOME)
-    logger.info("Python Version: %s", sys.version)
-    logger.info("Platform: %s", sys.platform)
-    logger.info("=" * 60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "\n".join(
+                [
+                    "=" * 60,
+                    "ShAI Passenger WSGI Auto-Initialization Starting...",
+                    f"Project Home: {PROJECT_HOME}",
+                    f"Python Version: {sys.version}",
+                    f"Platform: {sys.platform}",
+                    "=" * 60,
+                ]
+            )
+        )
 
     try:
         # Step 1: Setup environment
@@ -434,12 +584,23 @@ def auto_initialize():
 # Auto-initialize the application when this module is imported
 logger.info("Passenger WSGI module loaded - starting auto-initialization...")
 
-try:
-    application = auto_initialize()
-except Exception as critical_error:
-    logger.error("Critical error during initialization: %s", str(critical_error))
-    logger.error("Creating emergency fallback application")
-    application = create_minimal_wsgi_app()
+# Passenger can re-import this module; reuse the app built by an earlier import
+_APP_CACHE_KEY = "_shai_wsgi_app"
+
+application = sys.modules.get(_APP_CACHE_KEY)
+if application is not None:
+    logger.info("Reusing previously initialized application")
+else:
+    try:
+        application = auto_initialize()
+    except Exception as critical_error:
+        logger.error("Critical error during initialization: %s", str(critical_error))
+        logger.error("Creating emergency fallback application")
+        application = create_minimal_wsgi_app()
+
+    # Only cache the real app, so a fallback gets retried on the next import
+    if callable(getattr(application, "wsgi_app", None)):
+        sys.modules[_APP_CACHE_KEY] = application
 
 # Ensure we have a valid WSGI application
 if application is None:
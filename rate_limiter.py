@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+ShAI Rate Limiter
+
+Small thread-safe token bucket shared by the API test scripts
+(test_agreebot.py and test_tokens.py) to bound how hard they hit the
+server without sleeping a fixed amount between every call.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow bursts of up to `capacity` calls, refilled at `rate` per second."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, blocking only when the bucket is empty."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        # Sleep outside the lock; the debt is already booked so waiters queue up
+        if wait:
+            time.sleep(wait)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+ShAI API Response Cache
+
+Optional on-disk cache of successful API responses for the test scripts
+(test_agreebot.py and test_tokens.py). Entries are keyed by the SHA-1 of
+the endpoint and input, so re-running a script with --cache skips the
+HTTP call for inputs that already succeeded.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+
+class ResponseCache:
+    """JSON file of response payloads keyed by endpoint and input."""
+
+    def __init__(self, path, enabled=True):
+        self.path = os.fspath(path)
+        self.enabled = enabled
+        self._entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if enabled:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError):
+                # A corrupt cache is just a cold cache
+                self._entries = {}
+
+    @staticmethod
+    def _key(endpoint, user_input):
+        return hashlib.sha1(f"{endpoint}\0{user_input}".encode("utf-8")).hexdigest()
+
+    def get(self, endpoint, user_input):
+        """Return the cached payload, or None on a miss or when disabled."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._entries.get(self._key(endpoint, user_input))
+
+    def put(self, endpoint, user_input, payload):
+        """Remember a successful payload for this endpoint and input."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[self._key(endpoint, user_input)] = payload
+            self._dirty = True
+
+    def save(self):
+        """Write the cache back to disk if anything was added."""
+        with self._lock:
+            if not (self.enabled and self._dirty):
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -17,14 +17,36 @@ import sys
 import time
 import subprocess
 import argparse
+import http.client
+import json
 import webbrowser
 from pathlib import Path
 import signal
+import socket
 import threading
 
+from env_loader import parse_env_file
+
+# Address the local Ollama server listens on
+OLLAMA_ADDRESS = ("127.0.0.1", 11434)
+
 
 class ShAIStarter:
+    # "<color>[{timestamp}]<reset> " prefix for each log level
+    _LOG_PREFIXES = {
+        level: f"{color}[{{}}]\033[0m "
+        for level, color in {
+            "INFO": "\033[94m",  # Blue
+            "SUCCESS": "\033[92m",  # Green
+            "WARNING": "\033[93m",  # Yellow
+            "ERROR": "\033[91m",  # Red
+        }.items()
+    }
+
     def __init__(self):
+        # Formatted log timestamp, only refreshed when the second changes
+        self._last_ts = None
+        self._last_ts_str = ""
         self.project_root = Path(__file__).parent
         self.env_file = self.project_root / ".env"
         self.ollama_process = None
@@ -32,34 +54,32 @@ class ShAIStarter:
 
     def log(self, message: str, level: str = "INFO"):
         """Simple colored logging"""
-        colors = {
-            "INFO": "\033[94m",  # Blue
-            "SUCCESS": "\033[92m",  # Green
-            "WARNING": "\033[93m",  # Yellow
-            "ERROR": "\033[91m",  # Red
-            "RESET": "\033[0m",  # Reset
-        }
+        now = int(time.time())
+        if now != self._last_ts:
+            self._last_ts = now
+            self._last_ts_str = time.strftime("%H:%M:%S", time.localtime(now))
 
-        color = colors.get(level, colors["INFO"])
-        reset = colors["RESET"]
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"{color}[{timestamp}]{reset} {message}")
+        prefix = self._LOG_PREFIXES.get(level, self._LOG_PREFIXES["INFO"])
+        print(prefix.format(self._last_ts_str) + message)
 
-    def check_environment(self):
-        """Check if environment is properly configured"""
-        if not self.env_file.exists():
+    def _load_env(self):
+        """Read .env, running setup first if it doesn't exist yet"""
+        try:
+            return parse_env_file(self.env_file)
+        except FileNotFoundError:
             self.log("No .env file found. Running setup...", "WARNING")
             self.run_setup()
-            return self.check_environment()  # Recheck after setup
 
-        # Read environment variables
-        env_vars = {}
-        with open(self.env_file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    env_vars[key] = value
+        try:
+            return parse_env_file(self.env_file)
+        except FileNotFoundError:
+            self.log("Setup did not create a .env file", "ERROR")
+            return {}
+
+    def check_environment(self, env_vars=None):
+        """Check if environment is properly configured"""
+        if env_vars is None:
+            env_vars = self._load_env()
 
         use_local = env_vars.get("USE_LOCAL", "false").lower() == "true"
 
@@ -115,18 +135,20 @@ class ShAIStarter:
             )
             sys.exit(1)
 
-    def check_ollama(self):
-        """Check if Ollama is available and start if needed"""
+    def _ollama_listening(self, timeout=1):
+        """Return True if something is accepting connections on the Ollama port"""
         try:
-            # Check if Ollama is already running
-            import requests
+            socket.create_connection(OLLAMA_ADDRESS, timeout=timeout).close()
+            return True
+        except OSError:
+            return False
 
-            response = requests.get("http://localhost:11434", timeout=3)
-            if response.status_code == 200:
-                self.log("Ollama is already running", "SUCCESS")
-                return True
-        except:
-            pass
+    def check_ollama(self):
+        """Check if Ollama is available and start if needed"""
+        # Check if Ollama is already running
+        if self._ollama_listening():
+            self.log("Ollama is already running", "SUCCESS")
+            return True
 
         # Try to start Ollama
         self.log("Starting Ollama service...", "INFO")
@@ -138,18 +160,15 @@ class ShAIStarter:
                 stderr=subprocess.DEVNULL,
             )
 
-            # Wait for Ollama to start
-            for i in range(10):
-                time.sleep(2)
-                try:
-                    import requests
-
-                    response = requests.get("http://localhost:11434", timeout=1)
-                    if response.status_code == 200:
-                        self.log("Ollama started successfully", "SUCCESS")
-                        return True
-                except:
-                    continue
+            # Wait for Ollama to start, backing off from 50ms up to 500ms
+            delay = 0.05
+            deadline = time.monotonic() + 20
+            while time.monotonic() < deadline:
+                if self._ollama_listening(timeout=0.2):
+                    self.log("Ollama started successfully", "SUCCESS")
+                    return True
+                time.sleep(delay)
+                delay = min(delay * 1.5, 0.5)
 
             self.log("Ollama failed to start within 20 seconds", "ERROR")
             return False
@@ -164,11 +183,20 @@ class ShAIStarter:
     def check_ollama_model(self):
         """Ensure at least one model is available"""
         try:
-            result = subprocess.run(
-                ["ollama", "list"], capture_output=True, text=True, timeout=10
-            )
+            # Ask the running server directly rather than spawning `ollama list`
+            conn = http.client.HTTPConnection(*OLLAMA_ADDRESS, timeout=10)
+            try:
+                conn.request("GET", "/api/tags")
+                response = conn.getresponse()
+                models = (
+                    json.load(response).get("models", [])
+                    if response.status == 200
+                    else []
+                )
+            finally:
+                conn.close()
 
-            if result.returncode == 0 and len(result.stdout.strip().split("\n")) > 1:
+            if models:
                 self.log("Ollama models are available", "SUCCESS")
                 return True
             else:
@@ -273,7 +301,7 @@ class ShAIStarter:
             mode = force_mode
             self.log(f"Forced to {mode} mode", "INFO")
         else:
-            mode = self.check_environment()
+            mode = self.check_environment(self._load_env())
             if not mode:
                 sys.exit(1)
 
@@ -1,16 +1,32 @@
 #!/usr/bin/env python3
 """
 Test script for AgreeBot functionality.
-This script tests the /api/agree endpoint with various inputs.
+This script tests the /api/agree and /api/agree/batch endpoints with various inputs.
 """
 
 import requests
-import json
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api_client import BASE_URL, ApiTestRun, log_line
+from api_schemas import (
+    AgreeBatchResponse,
+    AgreeResponse,
+    from_builtins,
+    make_decoder,
+    to_builtins,
+)
+from jsonutil import dumps
 
 # Configuration
-BASE_URL = "http://localhost:5000"
-DELAY_BETWEEN_TESTS = 1  # seconds
+MAX_WORKERS = 8  # concurrent requests for the main test run
+BATCH_SIZE = 5  # inputs sent per /api/agree/batch call
+
+# Session, rate limiter and response cache; --rps/--cache applied in main()
+API = ApiTestRun(pool_maxsize=MAX_WORKERS)
+
+# Typed response decoders, built once
+decode_agree = make_decoder(AgreeResponse)
+decode_agree_batch = make_decoder(AgreeBatchResponse)
 
 # Test inputs for AgreeBot
 TEST_INPUTS = [
@@ -37,40 +53,114 @@ TEST_INPUTS = [
 ]
 
 
+def report_agreements(user_input, data):
+    """Print the outcome of one AgreeBot response and return whether it succeeded"""
+    if data.success:
+        agreements = data.agreements
+        lines = [
+            f"✅ Input: '{user_input}'",
+            f"   AgreeBot generated {len(agreements)} agreements:",
+        ]
+        lines += [f"   {i}. {agreement}" for i, agreement in enumerate(agreements, 1)]
+        log_line("\n".join(lines) + "\n")
+        return True
+    else:
+        log_line(
+            f"❌ API returned error for '{user_input}': {data.error or 'Unknown error'}"
+        )
+        return False
+
+
 def test_agreebot_api(user_input):
     """Test the AgreeBot API with a given input"""
     try:
-        response = requests.post(
-            f"{BASE_URL}/api/agree",
-            json={"input": user_input},
-            headers={"Content-Type": "application/json"},
-            timeout=30,
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success"):
-                agreements = data.get("agreements", [])
-                print(f"✅ Input: '{user_input}'")
-                print(f"   AgreeBot generated {len(agreements)} agreements:")
-                for i, agreement in enumerate(agreements, 1):
-                    print(f"   {i}. {agreement}")
-                print()
-                return True
-            else:
-                print(
-                    f"❌ API returned error for '{user_input}': {data.get('error', 'Unknown error')}"
+        cached = API.response_cache.get("/api/agree", user_input)
+        if cached is not None:
+            data = from_builtins(AgreeResponse, cached)
+        else:
+            API.rate_limiter.acquire()
+            response = API.session.post(
+                f"{BASE_URL}/api/agree",
+                data=dumps({"input": user_input}),
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
+
+            if response.status_code != 200:
+                log_line(
+                    f"❌ HTTP {response.status_code} for '{user_input}': {response.text}"
                 )
                 return False
-        else:
-            print(f"❌ HTTP {response.status_code} for '{user_input}': {response.text}")
-            return False
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed for '{user_input}': {str(e)}")
+            data = decode_agree(response.content)
+            if data.success:
+                API.response_cache.put("/api/agree", user_input, to_builtins(data))
+
+        return report_agreements(user_input, data)
+
+    except (requests.exceptions.RequestException, ValueError) as e:
+        log_line(f"❌ Request failed for '{user_input}': {str(e)}")
         return False
 
 
+def run_agreebot_batch(batch):
+    """Test several inputs with one /api/agree/batch call.
+
+    Falls back to one /api/agree call per input if the server has no batch
+    endpoint. Returns a success flag per input.
+    """
+    outcomes = {}
+    pending = []
+    for user_input in batch:
+        cached = API.response_cache.get("/api/agree", user_input)
+        if cached is not None:
+            outcomes[user_input] = report_agreements(
+                user_input, from_builtins(AgreeResponse, cached)
+            )
+        else:
+            pending.append(user_input)
+
+    if pending:
+        try:
+            API.rate_limiter.acquire()
+            response = API.session.post(
+                f"{BASE_URL}/api/agree/batch",
+                data=dumps({"inputs": pending}),
+                headers={"Content-Type": "application/json"},
+                timeout=30 * len(pending),
+            )
+
+            if response.status_code == 404:
+                for user_input in pending:
+                    outcomes[user_input] = test_agreebot_api(user_input)
+            elif response.status_code != 200:
+                for user_input in pending:
+                    log_line(f"❌ HTTP {response.status_code} for '{user_input}'")
+                    outcomes[user_input] = False
+            else:
+                results = decode_agree_batch(response.content).results
+                if len(results) != len(pending):
+                    log_line(
+                        f"⚠️  Batch returned {len(results)} results for "
+                        f"{len(pending)} inputs; sending the rest one at a time"
+                    )
+                for user_input, data in zip(pending, results):
+                    if data.success:
+                        API.response_cache.put(
+                            "/api/agree", user_input, to_builtins(data)
+                        )
+                    outcomes[user_input] = report_agreements(user_input, data)
+                for user_input in pending[len(results) :]:
+                    outcomes[user_input] = test_agreebot_api(user_input)
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            for user_input in pending:
+                log_line(f"❌ Request failed for '{user_input}': {str(e)}")
+                outcomes[user_input] = False
+
+    return [outcomes.get(user_input, False) for user_input in batch]
+
+
 def test_edge_cases():
     """Test edge cases for AgreeBot"""
     print("🧪 Testing Edge Cases:")
@@ -89,24 +179,27 @@ def test_edge_cases():
     for case in edge_cases:
         print(f"\nTesting: '{case[:50]}{'...' if len(case) > 50 else ''}'")
         test_agreebot_api(case)
-        time.sleep(0.5)
 
 
 def main():
     """Main test function"""
+    args = API.configure(__doc__.strip().splitlines()[0])
+
     print("🤖 Starting AgreeBot API tests...")
-    print(f"📍 Target URL: {BASE_URL}")
+    print(f"📍 Target URL: {BASE_URL or 'in-process Flask app'}")
+    print(f"⏱️  Rate limit: {args.rps:g} requests/second")
     print("=" * 60)
 
     # Test if the server is running
     try:
-        health_response = requests.get(f"{BASE_URL}/health", timeout=5)
+        API.rate_limiter.acquire()
+        health_response = API.session.get(f"{BASE_URL}/health", timeout=5)
         if health_response.status_code == 200:
             print("✅ Server is running!")
         else:
             print("⚠️  Server might have issues, but continuing with tests...")
     except:
-        print("❌ Cannot connect to server. Make sure it's running on localhost:5000")
+        print(f"❌ Cannot connect to server. Make sure it's running at {BASE_URL}")
         return
 
     print("\n🎯 Testing AgreeBot with various inputs...")
@@ -116,16 +209,23 @@ def main():
     failed_tests = 0
 
     try:
-        for i, test_input in enumerate(TEST_INPUTS, 1):
-            print(f"[Test {i}/{len(TEST_INPUTS)}]")
-
-            if test_agreebot_api(test_input):
-                successful_tests += 1
-            else:
-                failed_tests += 1
+        batches = [
+            TEST_INPUTS[i : i + BATCH_SIZE]
+            for i in range(0, len(TEST_INPUTS), BATCH_SIZE)
+        ]
+        print(
+            f"Running {len(TEST_INPUTS)} tests in {len(batches)} batches "
+            f"with {MAX_WORKERS} workers...\n"
+        )
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = [
+                outcome
+                for batch_outcomes in executor.map(run_agreebot_batch, batches)
+                for outcome in batch_outcomes
+            ]
 
-            if i < len(TEST_INPUTS):
-                time.sleep(DELAY_BETWEEN_TESTS)
+        successful_tests = sum(results)
+        failed_tests = len(results) - successful_tests
 
         # Test edge cases
         print("\n" + "=" * 60)
@@ -144,7 +244,8 @@ def main():
         success_rate = (successful_tests / (successful_tests + failed_tests)) * 100
         print(f"🎯 Success rate: {success_rate:.1f}%")
 
-    print(f"\n🌐 Visit AgreeBot in your browser: {BASE_URL}/agreebot")
+    if BASE_URL:
+        print(f"\n🌐 Visit AgreeBot in your browser: {BASE_URL}/agreebot")
     print("✨ AgreeBot testing completed!")
     print("\n💡 Remember: AgreeBot should agree with EVERYTHING!")
 
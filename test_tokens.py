@@ -5,13 +5,28 @@ This script makes API calls to generate pickup lines, which will increment the t
 """
 
 import requests
-import time
-import json
 import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api_client import BASE_URL, ApiTestRun, log_line
+from api_schemas import (
+    GenerateResponse,
+    TokenResponse,
+    from_builtins,
+    make_decoder,
+    to_builtins,
+)
+from jsonutil import dumps
 
 # Configuration
-BASE_URL = "http://localhost:5000"
-DELAY_BETWEEN_CALLS = 2  # seconds
+MAX_CONCURRENT_CALLS = 5  # /generate requests in flight at once
+
+# Session, rate limiter and response cache; --rps/--cache applied in main()
+API = ApiTestRun(pool_maxsize=MAX_CONCURRENT_CALLS)
+
+# Typed response decoders, built once
+decode_generate = make_decoder(GenerateResponse)
+decode_tokens = make_decoder(TokenResponse)
 
 # Test inputs for generating pickup lines
 TEST_INPUTS = [
@@ -41,57 +56,71 @@ TEST_INPUTS = [
 def make_pickup_line_request(user_input):
     """Make a request to generate pickup lines"""
     try:
-        response = requests.post(
-            f"{BASE_URL}/generate",
-            json={"input": user_input},
-            headers={"Content-Type": "application/json"},
-            timeout=30,
-        )
+        cached = API.response_cache.get("/generate", user_input)
+        if cached is not None:
+            data = from_builtins(GenerateResponse, cached)
+        else:
+            API.rate_limiter.acquire()
+            response = API.session.post(
+                f"{BASE_URL}/generate",
+                data=dumps({"input": user_input}),
+                headers={"Content-Type": "application/json"},
+                timeout=30,
+            )
 
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success"):
-                print(
-                    f"✅ Generated {len(data.get('pickup_lines', []))} pickup lines for: '{user_input}'"
-                )
-                return True
-            else:
-                print(
-                    f"❌ API returned error for '{user_input}': {data.get('error', 'Unknown error')}"
+            if response.status_code != 200:
+                log_line(
+                    f"❌ HTTP {response.status_code} for '{user_input}': {response.text}"
                 )
                 return False
+
+            data = decode_generate(response.content)
+            if data.success:
+                API.response_cache.put("/generate", user_input, to_builtins(data))
+
+        if data.success:
+            log_line(
+                f"✅ Generated {len(data.pickup_lines)} pickup lines for: '{user_input}'"
+            )
+            return True
         else:
-            print(f"❌ HTTP {response.status_code} for '{user_input}': {response.text}")
+            log_line(
+                f"❌ API returned error for '{user_input}': {data.error or 'Unknown error'}"
+            )
             return False
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed for '{user_input}': {str(e)}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        log_line(f"❌ Request failed for '{user_input}': {str(e)}")
         return False
 
 
 def check_token_usage():
     """Check current token usage"""
     try:
-        response = requests.get(f"{BASE_URL}/api/tokens", timeout=10)
+        API.rate_limiter.acquire()
+        response = API.session.get(f"{BASE_URL}/api/tokens", timeout=10)
         if response.status_code == 200:
-            data = response.json()
-            tokens = data.get("tokens", 0)
-            gallons = data.get("gallons", 0.0)
-            print(f"🔢 Current usage: {tokens:,} tokens = {gallons:.3f} gallons")
+            data = decode_tokens(response.content)
+            tokens = data.tokens
+            gallons = data.gallons
+            log_line(f"🔢 Current usage: {tokens:,} tokens = {gallons:.3f} gallons")
             return tokens, gallons
         else:
-            print(f"❌ Failed to get token usage: HTTP {response.status_code}")
+            log_line(f"❌ Failed to get token usage: HTTP {response.status_code}")
             return None, None
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to check token usage: {str(e)}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        log_line(f"❌ Failed to check token usage: {str(e)}")
         return None, None
 
 
 def main():
     """Main test function"""
+    args = API.configure(__doc__.strip().splitlines()[0])
+
     print("🚀 Starting token usage test...")
-    print(f"📍 Target URL: {BASE_URL}")
-    print(f"⏱️  Delay between calls: {DELAY_BETWEEN_CALLS} seconds")
+    print(f"📍 Target URL: {BASE_URL or 'in-process Flask app'}")
+    print(f"⏱️  Concurrent calls: {MAX_CONCURRENT_CALLS}")
+    print(f"⏱️  Rate limit: {args.rps:g} requests/second")
     print("=" * 50)
 
     # Check initial token usage
@@ -112,23 +141,22 @@ def main():
     failed_calls = 0
 
     try:
-        for i, test_input in enumerate(TEST_INPUTS, 1):
-            print(f"\n[{i}/{len(TEST_INPUTS)}] Testing: '{test_input}'")
-
-            if make_pickup_line_request(test_input):
-                successful_calls += 1
-            else:
-                failed_calls += 1
-
-            # Check token usage every 5 calls
-            if i % 5 == 0:
-                print(f"\n📊 Token usage check after {i} calls:")
-                check_token_usage()
-
-            # Wait between calls (except for the last one)
-            if i < len(TEST_INPUTS):
-                print(f"⏳ Waiting {DELAY_BETWEEN_CALLS} seconds...")
-                time.sleep(DELAY_BETWEEN_CALLS)
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CALLS) as executor:
+            futures = [
+                executor.submit(make_pickup_line_request, test_input)
+                for test_input in TEST_INPUTS
+            ]
+
+            for i, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    successful_calls += 1
+                else:
+                    failed_calls += 1
+
+                # Check token usage every 5 completed calls
+                if i % 5 == 0:
+                    print(f"\n📊 Token usage check after {i} calls:")
+                    check_token_usage()
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Test interrupted by user!")
@@ -155,7 +183,8 @@ def main():
             )
             print(f"📈 Average tokens per successful call: {avg_tokens_per_call:.1f}")
 
-    print(f"\n🌐 Visit the wahduh page to see the results: {BASE_URL}/wahduh")
+    if BASE_URL:
+        print(f"\n🌐 Visit the wahduh page to see the results: {BASE_URL}/wahduh")
     print("✨ Test completed!")
 
 
@@ -0,0 +1,78 @@
+"""
+Shared pytest configuration and fixtures for the ShAI test suite.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def pytest_configure(config):
+    """Register the custom markers used by the tests"""
+    config.addinivalue_line(
+        "markers", "unit: fast tests that don't touch the app or network"
+    )
+
+
+@pytest.fixture(scope="session")
+def app_instance():
+    """Configure the Flask application for testing once per session"""
+    from app import app
+
+    original = {key: app.config.get(key) for key in ("TESTING", "SECRET_KEY")}
+    app.config.update(TESTING=True, SECRET_KEY="test-secret-key")
+    yield app
+    app.config.update(original)
+
+
+@pytest.fixture
+def client(app_instance):
+    """Create a test client for the Flask application"""
+    with app_instance.test_client() as client:
+        yield client
+
+
+def _mock_response(payload):
+    """Build a successful requests.Response stand-in returning `payload`"""
+    response = MagicMock(status_code=200)
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    return response
+
+
+@pytest.fixture(scope="session")
+def claude_response_factory():
+    """Return a function building (and reusing) Claude responses for a text"""
+    responses = {}
+
+    def factory(text):
+        if text not in responses:
+            responses[text] = _mock_response({"content": [{"text": text}]})
+        return responses[text]
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def ollama_response_factory():
+    """Return a function building (and reusing) Ollama responses for a text"""
+    responses = {}
+
+    def factory(text):
+        if text not in responses:
+            responses[text] = _mock_response({"response": text})
+        return responses[text]
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def ok_claude_response(claude_response_factory):
+    """Successful Claude response containing a JSON array of three lines"""
+    return claude_response_factory('["Line 1", "Line 2", "Line 3"]')
@@ -15,37 +15,29 @@ import json
 import os
 import sys
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 # Import the app
-from app import app, PickupLineGenerator
+from app import PickupLineGenerator
 
 
 class TestShAIApp:
     """Test cases for the main ShAI Flask application"""
 
-    @pytest.fixture
-    def client(self):
-        """Create a test client for the Flask application"""
-        app.config["TESTING"] = True
-        app.config["SECRET_KEY"] = "test-secret-key"
-        with app.test_client() as client:
-            yield client
-
     @pytest.fixture
     def mock_generator(self):
         """Mock pickup line generator for testing"""
         generator = PickupLineGenerator()
         return generator
 
-    def test_app_configuration(self):
+    def test_app_configuration(self, app_instance):
         """Test that the app is properly configured"""
-        assert app is not None
-        assert app.config["TESTING"] is True
+        assert app_instance is not None
+        assert app_instance.config["TESTING"] is True
 
     def test_index_route(self, client):
         """Test the main index page loads correctly"""
@@ -132,6 +124,55 @@ class TestShAIApp:
             assert data["success"] is False
             assert "error" in data
 
+    def test_agree_batch_endpoint(self, client):
+        """Test batched AgreeBot generation"""
+        with patch("app.AgreeBot.generate_agreements") as mock_agree:
+            mock_agree.return_value = ["Absolutely!", "So true!"]
+
+            response = client.post(
+                "/api/agree/batch",
+                data=json.dumps({"inputs": ["Coffee is great", "   "]}),
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+
+            assert data["success"] is True
+            assert len(data["results"]) == 2
+            assert data["results"][0]["success"] is True
+            assert data["results"][0]["agreements"] == ["Absolutely!", "So true!"]
+            assert data["results"][1]["success"] is False
+            mock_agree.assert_called_once_with("Coffee is great")
+
+    def test_agree_batch_endpoint_non_string_inputs(self, client):
+        """Test that null and non-string batch inputs are rejected per item"""
+        with patch("app.AgreeBot.generate_agreements") as mock_agree:
+            response = client.post(
+                "/api/agree/batch",
+                data=json.dumps({"inputs": [None, 42]}),
+                content_type="application/json",
+            )
+
+            assert response.status_code == 200
+            data = json.loads(response.data)
+
+            assert [result["success"] for result in data["results"]] == [False, False]
+            assert all("error" in result for result in data["results"])
+            mock_agree.assert_not_called()
+
+    def test_agree_batch_endpoint_no_inputs(self, client):
+        """Test batched AgreeBot generation with no inputs"""
+        response = client.post(
+            "/api/agree/batch",
+            data=json.dumps({"inputs": []}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert "error" in data
+
     def test_404_error_handler(self, client):
         """Test custom 404 error page"""
         response = client.get("/nonexistent-page")
@@ -177,16 +218,10 @@ class TestPickupLineGenerator:
         assert len(result) > 0
 
     @patch("requests.post")
-    def test_claude_api_success(self, mock_post, generator):
+    def test_claude_api_success(self, mock_post, generator, ok_claude_response):
         """Test successful Claude API call"""
         # Mock successful Claude API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
-            "content": [{"text": '["Line 1", "Line 2", "Line 3"]'}]
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = ok_claude_response
 
         with patch.dict(
             os.environ, {"CLAUDE_API_KEY": "test-key", "USE_LOCAL": "false"}
@@ -205,14 +240,10 @@ class TestPickupLineGenerator:
                 generator.generate_with_claude("test input")
 
     @patch("requests.post")
-    def test_ollama_api_success(self, mock_post, generator):
+    def test_ollama_api_success(self, mock_post, generator, ollama_response_factory):
         """Test successful Ollama API call"""
         # Mock successful Ollama API response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {"response": "Line 1\nLine 2\nLine 3"}
-        mock_post.return_value = mock_response
+        mock_post.return_value = ollama_response_factory("Line 1\nLine 2\nLine 3")
 
         result = generator.generate_with_ollama("test input")
         assert isinstance(result, list)
@@ -252,28 +283,18 @@ class TestPickupLineGenerator:
 class TestEnvironmentConfiguration:
     """Test environment variable handling and configuration"""
 
+    @pytest.mark.unit
     def test_local_configuration(self):
         """Test local development configuration"""
         with patch.dict(os.environ, {"USE_LOCAL": "true"}):
-            # Reload the module to pick up env changes
-            import importlib
-            import app
-
-            importlib.reload(app)
-
             assert os.environ.get("USE_LOCAL").lower() == "true"
 
+    @pytest.mark.unit
     def test_production_configuration(self):
         """Test production configuration"""
         with patch.dict(
             os.environ, {"USE_LOCAL": "false", "CLAUDE_API_KEY": "test-key"}
         ):
-            # Reload the module to pick up env changes
-            import importlib
-            import app
-
-            importlib.reload(app)
-
             assert os.environ.get("USE_LOCAL").lower() == "false"
             assert os.environ.get("CLAUDE_API_KEY") == "test-key"
 
@@ -291,37 +312,29 @@ class TestEnvironmentConfiguration:
 class TestUtilityFunctions:
     """Test utility functions and edge cases"""
 
-    def test_json_parsing_fallback(self):
+    def test_json_parsing_fallback(self, claude_response_factory):
         """Test JSON parsing with fallback to text splitting"""
         generator = PickupLineGenerator()
 
         # Test with non-JSON response
         with patch("requests.post") as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status.return_value = None
-            mock_response.json.return_value = {
-                "content": [{"text": "Line 1\nLine 2\nLine 3"}]  # Not JSON format
-            }
-            mock_post.return_value = mock_response
+            mock_post.return_value = claude_response_factory(
+                "Line 1\nLine 2\nLine 3"  # Not JSON format
+            )
 
             with patch.dict(os.environ, {"CLAUDE_API_KEY": "test-key"}):
                 result = generator.generate_with_claude("test")
                 assert isinstance(result, list)
                 assert len(result) >= 1
 
-    def test_ollama_response_cleaning(self):
+    def test_ollama_response_cleaning(self, ollama_response_factory):
         """Test cleaning of numbered/bulleted responses from Ollama"""
         generator = PickupLineGenerator()
 
         with patch("requests.post") as mock_post:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status.return_value = None
-            mock_response.json.return_value = {
-                "response": "1. First line\n2. Second line\n• Third line\n- Fourth line"
-            }
-            mock_post.return_value = mock_response
+            mock_post.return_value = ollama_response_factory(
+                "1. First line\n2. Second line\n• Third line\n- Fourth line"
+            )
 
             result = generator.generate_with_ollama("test")
             assert isinstance(result, list)
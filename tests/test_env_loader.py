@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+ShAI .env Loader Tests
+
+Tests for the shared .env parser used by passenger_wsgi.py and start.py.
+
+Run with:
+    pytest tests/test_env_loader.py -v
+"""
+
+import os
+
+import pytest
+
+import env_loader
+from env_loader import parse_env_file
+
+
+@pytest.fixture
+def write_env(tmp_path):
+    """Write text to a fresh .env file and return its path"""
+    path = tmp_path / ".env"
+
+    def write(text):
+        path.write_bytes(text.encode("utf-8"))
+        return path
+
+    yield write
+    env_loader._ENV_CACHE.clear()
+
+
+@pytest.mark.unit
+class TestParseEnvFile:
+    """Test cases for parse_env_file"""
+
+    def test_plain_values(self, write_env):
+        """Test unquoted values and whitespace around '='"""
+        path = write_env("FLASK_ENV=production\nDEBUG = false\n  USE_LOCAL=true\n")
+        assert parse_env_file(path) == {
+            "FLASK_ENV": "production",
+            "DEBUG": "false",
+            "USE_LOCAL": "true",
+        }
+
+    def test_quoted_values(self, write_env):
+        """Test that quotes are removed and their contents kept verbatim"""
+        path = write_env(
+            'DOUBLE="hello world"\nSINGLE=\'it # stays\'\nEMPTY=""\nHASH="a#b"\n'
+        )
+        assert parse_env_file(path) == {
+            "DOUBLE": "hello world",
+            "SINGLE": "it # stays",
+            "EMPTY": "",
+            "HASH": "a#b",
+        }
+
+    def test_inline_comments(self, write_env):
+        """Test that ' # comment' ends an unquoted value but a bare '#' doesn't"""
+        path = write_env(
+            "CLAUDE_API_KEY=sk-abc # production key\n"
+            'QUOTED="value" # comment\n'
+            "SECRET_KEY=abc#def\n"
+        )
+        assert parse_env_file(path) == {
+            "CLAUDE_API_KEY": "sk-abc",
+            "QUOTED": "value",
+            "SECRET_KEY": "abc#def",
+        }
+
+    def test_export_prefix(self, write_env):
+        """Test that a leading 'export ' is dropped from the key"""
+        path = write_env("export FLASK_ENV=production\nexport  DEBUG='false'\n")
+        assert parse_env_file(path) == {"FLASK_ENV": "production", "DEBUG": "false"}
+
+    def test_blank_comment_and_malformed_lines(self, write_env):
+        """Test that lines without a valid assignment are skipped"""
+        path = write_env(
+            "\n"
+            "   \n"
+            "# FLASK_ENV=development\n"
+            "NO_EQUALS_SIGN\n"
+            "1BAD=value\n"
+            "=value\n"
+            "GOOD=yes\r\n"
+        )
+        assert parse_env_file(path) == {"GOOD": "yes"}
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file raises FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            parse_env_file(tmp_path / ".env")
+
+    def test_cache_reused_until_mtime_changes(self, write_env):
+        """Test that the parse is cached per mtime and redone after a change"""
+        path = write_env("DEBUG=false\n")
+        first = parse_env_file(path)
+        assert parse_env_file(path) is first
+
+        write_env("DEBUG=true\n")
+        mtime_ns = os.stat(path).st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        assert parse_env_file(path) == {"DEBUG": "true"}
+        # The stale entry for this path is dropped
+        assert len([k for k in env_loader._ENV_CACHE if k[0] == str(path)]) == 1
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+ShAI Buffered Log Handler Tests
+
+Tests for the buffered file handlers used by passenger_wsgi.py and wsgi.py.
+
+Run with:
+    pytest tests/test_log_handlers.py -v
+"""
+
+import logging
+
+import pytest
+
+from log_handlers import BufferedFileHandler, BufferedRotatingFileHandler
+
+
+def _record(message, level=logging.INFO):
+    return logging.LogRecord("shai.test", level, __file__, 1, message, None, None)
+
+
+@pytest.mark.unit
+class TestBufferedHandlers:
+    """Test cases for BufferedFileHandler and BufferedRotatingFileHandler"""
+
+    @pytest.fixture(params=[BufferedFileHandler, BufferedRotatingFileHandler])
+    def handler_factory(self, request, tmp_path):
+        """Build a buffered handler writing to a file in tmp_path"""
+        handlers = []
+
+        def factory(**kwargs):
+            handler = request.param(str(tmp_path / "test.log"), delay=True, **kwargs)
+            handlers.append(handler)
+            return handler
+
+        yield factory
+        for handler in handlers:
+            handler.close()
+
+    def test_info_records_stay_buffered(self, handler_factory, tmp_path):
+        """Test that routine records are only written on flush_buffer()"""
+        handler = handler_factory()
+        handler.emit(_record("first"))
+        handler.flush()
+
+        assert (tmp_path / "test.log").read_text() == ""
+
+        handler.flush_buffer()
+        assert (tmp_path / "test.log").read_text() == "first\n"
+
+    def test_warnings_are_flushed(self, handler_factory, tmp_path):
+        """Test that warnings reach the file straight away"""
+        handler = handler_factory()
+        handler.emit(_record("routine"))
+        handler.emit(_record("problem", logging.WARNING))
+
+        assert (tmp_path / "test.log").read_text() == "routine\nproblem\n"
+
+    def test_close_writes_buffer(self, handler_factory, tmp_path):
+        """Test that closing the handler writes out buffered records"""
+        handler = handler_factory()
+        handler.emit(_record("last words"))
+        handler.close()
+
+        assert (tmp_path / "test.log").read_text() == "last words\n"
+
+    def test_rotating_handler_rolls_over(self, tmp_path):
+        """Test that the rotating handler tracks its size and rolls over"""
+        handler = BufferedRotatingFileHandler(
+            str(tmp_path / "test.log"), maxBytes=20, backupCount=2, delay=True
+        )
+        try:
+            for i in range(4):
+                handler.emit(_record(f"record {i:02d}"))
+        finally:
+            handler.close()
+
+        assert (tmp_path / "test.log").read_text() == "record 03\n"
+        assert (tmp_path / "test.log.1").read_text() == "record 02\n"
+        assert (tmp_path / "test.log.2").read_text() == "record 01\n"
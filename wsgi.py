@@ -8,21 +8,24 @@ For Namecheap shared hosting and other production environments.
 
 import sys
 import os
-from pathlib import Path
+
+# Project paths, computed once as plain strings
+project_dir = os.path.dirname(os.path.abspath(__file__))
+env_path = os.path.join(project_dir, ".env")
+log_dir = os.path.join(project_dir, "logs")
+log_file = os.path.join(log_dir, "shai.log")
 
 # Add the project directory to the Python path
-project_dir = Path(__file__).parent
-sys.path.insert(0, str(project_dir))
+sys.path.insert(0, project_dir)
+
+from env_loader import parse_env_file
 
 # Load environment variables from .env file if it exists
 try:
-    from dotenv import load_dotenv
-
-    env_path = project_dir / ".env"
-    if env_path.exists():
-        load_dotenv(env_path)
-except ImportError:
-    # dotenv not available, environment variables should be set by hosting provider
+    for key, value in parse_env_file(env_path).items():
+        os.environ.setdefault(key, value)
+except FileNotFoundError:
+    # No .env file, environment variables should be set by hosting provider
     pass
 
 # Set default environment variables for production
@@ -37,33 +40,51 @@ except ImportError as e:
     print(f"Error importing application: {e}")
 
     # Create a minimal error application
-    from flask import Flask, jsonify
+    from flask import Flask, Response
+
+    from jsonutil import dumps
 
     application = Flask(__name__)
 
     @application.route("/")
     def error():
-        return jsonify(
+        body = dumps(
             {
                 "error": "Application failed to load",
                 "message": "Please check the server configuration and try again.",
             }
-        ), 500
+        )
+        return Response(body, status=500, mimetype="application/json")
 
 
 # Configure logging for production
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import signal
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
-if not application.debug:
+from log_handlers import BufferedRotatingFileHandler
+
+# Name of the queue handler feeding shai.log, used to detect an earlier setup
+LOG_HANDLER_NAME = "shai_file_log"
+
+# Skip the setup if an earlier import already attached our log handler
+_has_file_handler = any(
+    handler.get_name() == LOG_HANDLER_NAME for handler in application.logger.handlers
+)
+
+if not application.debug and not _has_file_handler:
     # Set up file logging
-    log_dir = project_dir / "logs"
-    log_dir.mkdir(exist_ok=True)
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
 
-    file_handler = RotatingFileHandler(
-        log_dir / "shai.log",
+    file_handler = BufferedRotatingFileHandler(
+        log_file,
         maxBytes=10240000,  # 10MB
         backupCount=10,
+        delay=True,
     )
     file_handler.setFormatter(
         logging.Formatter(
@@ -71,7 +92,49 @@ if not application.debug:
         )
     )
     file_handler.setLevel(logging.INFO)
-    application.logger.addHandler(file_handler)
+
+    # Request threads only enqueue records; a background listener does the
+    # file writes and rotation
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.set_name(LOG_HANDLER_NAME)
+    application.logger.addHandler(queue_handler)
+
+    log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    log_listener.start()
+
+    def _shutdown_file_logging():
+        """Drain queued records and write out the file buffer; safe to repeat"""
+        global log_listener
+        if log_listener is not None:
+            log_listener.stop()
+            log_listener = None
+        file_handler.flush_buffer()
+
+    atexit.register(_shutdown_file_logging)
+
+    # atexit doesn't run when a worker is killed by SIGTERM, so drain the
+    # queue and write out the file buffer there too. The server's own handler
+    # may shut down gracefully, so requests still in flight log straight to
+    # the file from then on instead of to a queue nobody drains.
+    _previous_sigterm = signal.getsignal(signal.SIGTERM)
+
+    def _flush_logs_on_sigterm(signum, frame):
+        _shutdown_file_logging()
+        application.logger.removeHandler(queue_handler)
+        application.logger.addHandler(file_handler)
+
+        if callable(_previous_sigterm):
+            _previous_sigterm(signum, frame)
+        elif _previous_sigterm in (signal.SIG_DFL, None):
+            # None means a handler installed outside Python; fall back to the
+            # default action so the worker still exits
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    # Signal handlers can only be installed from the main thread
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _flush_logs_on_sigterm)
 
     application.logger.setLevel(logging.INFO)
     application.logger.info("ShAI application startup")